@@ -0,0 +1 @@
+"""Benchmark dashboard (jalankan dari root repo: python -m benchmarks.<nama>)."""
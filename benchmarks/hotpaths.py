@@ -0,0 +1,295 @@
+"""Benchmark jalur panas dashboard pada skala provinsi / kab-kota / klaster desa.
+
+Semua data & geometri dibangkitkan sintetis (offline) dengan skema VAR_MAPPING
+yang sama, lalu tiap tahap diukur terpisah: waktu (median beberapa ulangan),
+puncak memori (tracemalloc, pass terpisah) dan ukuran peta terserialisasi.
+Hasil ditulis ke JSON agar bisa dibandingkan antar commit.
+
+Pemakaian:
+    python -m benchmarks.hotpaths                       # 34, 514, 7000 wilayah
+    python -m benchmarks.hotpaths --scales 34 514 --repeat 5
+    python -m benchmarks.hotpaths --compare lama.json baru.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from shapely.geometry import Polygon
+
+from geoai import analysis, datastore
+from geoai.charts import distribution_figure
+from geoai.maps import MODE_KLASTER, MODE_VARIABEL, build_map, merge_geodata, prepare_layers
+from geoai.metadata import VAR_MAPPING
+from geoai.names import reconcile_keys, resolve_names
+from geoai.sensitivity import ThresholdSweep, threshold_grid
+from geoai.similarity import SimilarityIndex
+from geoai.stats import cluster_cube
+from geoai.table import TableIndex
+
+SCALES = {34: "provinsi", 514: "kabupaten/kota", 7000: "klaster desa"}
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+VERTICES_PER_EDGE = 8
+PANEL_YEARS = [2019, 2020, 2021, 2022, 2023]
+
+
+def synthetic_dataset(n, seed=0):
+    """Frame mentah seperti xlsx: Provinsi, X1..X14, Cluster"""
+    rng = np.random.default_rng(seed)
+    data = {"id": np.arange(1, n + 1), "Kode": np.arange(n), "Provinsi": [f"Kab. Wilayah {i:05d}" for i in range(n)]}
+    for code in VAR_MAPPING:
+        data[code] = rng.lognormal(3, 1, n).round(2)
+    data["Cluster"] = rng.integers(-1, 7, n)
+    return pd.DataFrame(data)
+
+
+def synthetic_panel(n, years=PANEL_YEARS):
+    """Data panel: satu frame sintetis per tahun dengan kolom Tahun"""
+    return pd.concat([synthetic_dataset(n, seed=i).assign(Tahun=y) for i, y in enumerate(years)], ignore_index=True)
+
+
+def arrow_bytes(frame):
+    """Ukuran frame sebagai Arrow IPC (format yang dikirim st.dataframe)"""
+    sink = pa.BufferOutputStream()
+    table = pa.Table.from_pandas(frame)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def synthetic_geometry(n, misspelled=0.01, seed=0):
+    """Grid poligon bertepi bergerigi; sebagian kecil nama sengaja salah eja"""
+    rng = np.random.default_rng(seed)
+    cols = int(np.ceil(np.sqrt(n)))
+    size = 40.0 / cols
+    t = np.linspace(0, 1, VERTICES_PER_EDGE, endpoint=False)
+    names, polys = [], []
+    for i in range(n):
+        x0, y0 = 95 + (i % cols) * size, -10 + (i // cols) * size
+        jitter = rng.normal(0, size * 0.02, (4, VERTICES_PER_EDGE))
+        ring = ([(x0 + size * u, y0 + j) for u, j in zip(t, jitter[0])]
+                + [(x0 + size + j, y0 + size * u) for u, j in zip(t, jitter[1])]
+                + [(x0 + size * (1 - u), y0 + size + j) for u, j in zip(t, jitter[2])]
+                + [(x0 + j, y0 + size * (1 - u)) for u, j in zip(t, jitter[3])])
+        polys.append(Polygon(ring))
+        name = f"KABUPATEN WILAYAH {i:05d}"
+        if rng.random() < misspelled:
+            name = name.replace("WILAYAH", "WILAYA")
+        names.append(name)
+    return gpd.GeoDataFrame({"Provinsi": names}, geometry=polys, crs=4326)
+
+
+def _time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def _peak_kb(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def bench_scale(n, repeat, workdir):
+    """Ukur semua tahap untuk satu skala. Return dict tahap -> hasil."""
+    raw = synthetic_dataset(n)
+    xlsx = os.path.join(workdir, f"bench_{n}.xlsx")
+    raw.to_excel(xlsx, index=False)
+    cache_dir = os.path.join(workdir, f"cache_{n}")
+    geo = synthetic_geometry(n)
+    panel = datastore.prepare_dataset(synthetic_panel(n), "panel")
+
+    state = {}
+
+    def load_cold():
+        # Sidecar dihapus dulu: parse xlsx + validasi + tulis Feather
+        for p in datastore.sidecar_paths(xlsx, cache_dir):
+            if os.path.exists(p): os.remove(p)
+        state["df"] = datastore.load_dataset(xlsx, cache_dir)
+
+    def load_warm():
+        state["df"] = datastore.load_dataset(xlsx, cache_dir)
+
+    def normalize():
+        state["geo_keys"] = resolve_names(geo["Provinsi"])
+
+    def merge():
+        gdf = state["gdf"] = geo.assign(Provinsi_Key=state["geo_keys"])
+        df, _ = reconcile_keys(state["df"], gdf)
+        state["gdf_final"] = merge_geodata(gdf, df)
+        state["df_merged"] = df
+
+    def map_cluster():
+        layers = prepare_layers(state["gdf_final"], state["df_merged"], MODE_KLASTER)
+        state["map_cluster"] = build_map(layers, MODE_KLASTER, None, "OpenStreetMap").get_root().render()
+
+    def map_variable():
+        var = VAR_MAPPING["X2"]
+        layers = prepare_layers(state["gdf_final"], state["df_merged"], MODE_VARIABEL, var)
+        state["map_variable"] = build_map(layers, MODE_VARIABEL, var, "OpenStreetMap").get_root().render()
+
+    def year_full():
+        # Pergantian tahun lewat rerun penuh: snapshot -> merge -> layer -> HTML peta
+        rows, _ = reconcile_keys(datastore.year_snapshot(panel, PANEL_YEARS[0]), state["gdf"])
+        gdf_final = merge_geodata(state["gdf"], rows)
+        layers = prepare_layers(gdf_final, rows, MODE_KLASTER)
+        state["year_full"] = build_map(layers, MODE_KLASTER, None, "OpenStreetMap").get_root().render()
+
+    def year_frames():
+        # Sekali saat load: update style per tahun; pergantian tahun di browser tanpa rerun
+        state["year_frames"] = prepare_layers(state["gdf_final"], state["df_merged"], MODE_KLASTER, panel=panel)
+
+    def box_raw():
+        # Box plot lama: semua titik dari frame mentah
+        state["box_raw"] = distribution_figure(state["df"], VAR_MAPPING["X2"], show_points=True).to_json()
+
+    def box_cube():
+        # Kubus statistik + box dari ringkasan (titik outlier saja)
+        cube = cluster_cube(state["df"])
+        state["box_cube"] = distribution_figure(state["df"], VAR_MAPPING["X2"], cube).to_json()
+
+    def table_full():
+        # Tabel lama: mask boolean per rerun + seluruh frame (semua kolom) ke browser
+        label = panel['Cluster_Label'].iloc[0]
+        state["table_full"] = arrow_bytes(panel[panel['Cluster_Label'] == label])
+
+    def table_page():
+        # Indeks dibangun sekali per versi data; per rerun hanya query + satu halaman
+        if "table_index" not in state:
+            state["table_index"] = TableIndex(panel, ('Cluster_Label', 'Tahun'))
+        index = state["table_index"]
+        rows = index.query({'Cluster_Label': panel['Cluster_Label'].iloc[0]}, "wilayah", VAR_MAPPING["X2"], False)
+        state["table_page"] = arrow_bytes(index.page(rows, 1, 50, ['Provinsi', 'Cluster_Label', VAR_MAPPING["X2"]]))
+
+    def similar_build():
+        state["similar"] = SimilarityIndex(state["df"])
+
+    def similar_query():
+        # 100 query top-5 (ruang semua indikator); waktu per query = hasil / 100
+        index = state["similar"]
+        for name in index.names[np.linspace(0, len(index) - 1, 100).astype(int)]:
+            index.query(name, 5)
+
+    sweep_grid = threshold_grid(0.05, 1.5, 0.01)
+
+    def sweep_loop():
+        # Cara lama: seluruh analisis dihitung ulang sekali per ambang
+        for t in sweep_grid:
+            ThresholdSweep(state["df"], [t], threshold=t)
+
+    def sweep_batch():
+        # Semua ambang grid (146) dalam satu broadcast + perkalian matriks batch
+        ThresholdSweep(state["df"], sweep_grid)
+
+    def emoji():
+        analysis._memo.clear()
+        analysis.generate_emoji_analysis(state["df"])
+
+    stages = [("load_dataset_cold", load_cold), ("load_dataset_warm", load_warm),
+              ("normalize_names", normalize), ("merge", merge),
+              ("map_cluster", map_cluster), ("map_variable", map_variable),
+              ("year_switch_full", year_full), ("year_frames", year_frames),
+              ("box_raw", box_raw), ("box_cube", box_cube),
+              ("table_full", table_full), ("table_page", table_page),
+              ("similar_build", similar_build), ("similar_query_x100", similar_query),
+              ("sweep_loop", sweep_loop), ("sweep_batch", sweep_batch),
+              ("emoji_analysis", emoji)]
+
+    results = {}
+    for name, fn in stages:
+        times = _time(fn, repeat)
+        results[name] = {"median_s": statistics.median(times), "min_s": min(times),
+                         "peak_kb": round(_peak_kb(fn), 1)}
+    results["map_cluster"]["html_bytes"] = len(state["map_cluster"].encode("utf-8"))
+    results["map_variable"]["html_bytes"] = len(state["map_variable"].encode("utf-8"))
+    results["year_switch_full"]["html_bytes"] = len(state["year_full"].encode("utf-8"))
+    results["box_raw"]["html_bytes"] = len(state["box_raw"].encode("utf-8"))
+    results["box_cube"]["html_bytes"] = len(state["box_cube"].encode("utf-8"))
+    results["table_full"]["html_bytes"] = state["table_full"]
+    results["table_page"]["html_bytes"] = state["table_page"]
+    # Byte per pergantian tahun = satu frame (style + properti), bukan seluruh peta
+    results["year_frames"]["html_bytes"] = state["year_frames"]["frames_bytes"] // len(PANEL_YEARS)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(scales, repeat, output=None):
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "repeat": repeat,
+        "scales": {},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in scales:
+            print(f"== {n} wilayah ({SCALES.get(n, 'kustom')})", flush=True)
+            res = bench_scale(n, repeat, workdir)
+            for stage, r in res.items():
+                extra = f"  {r['html_bytes']:>12,} B" if "html_bytes" in r else ""
+                print(f"  {stage:<20}{r['median_s'] * 1000:>10.1f} ms{r['peak_kb']:>12,.0f} KB{extra}")
+            report["scales"][str(n)] = res
+
+    output = output or os.path.join(RESULTS_DIR, f"hotpaths-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil: {output}")
+    return report
+
+
+def compare(old_path, new_path):
+    """Cetak rasio waktu & memori (baru / lama) per skala dan tahap"""
+    with open(old_path, encoding="utf-8") as f: old = json.load(f)
+    with open(new_path, encoding="utf-8") as f: new = json.load(f)
+    print(f"{old['commit']} -> {new['commit']}")
+    for scale, stages in new["scales"].items():
+        base = old["scales"].get(scale, {})
+        for stage, r in stages.items():
+            if stage not in base: continue
+            ratio = r["median_s"] / base[stage]["median_s"] if base[stage]["median_s"] else float("nan")
+            mem = r["peak_kb"] / base[stage]["peak_kb"] if base[stage]["peak_kb"] else float("nan")
+            flag = "  <-- lebih lambat" if ratio > 1.2 else ""
+            print(f"  {scale:>6} {stage:<20} waktu x{ratio:5.2f}  memori x{mem:5.2f}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark jalur panas dashboard")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="file JSON hasil (default benchmarks/results/hotpaths-<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("LAMA", "BARU"))
+    args = parser.parse_args(argv)
+    if args.compare:
+        compare(*args.compare)
+    else:
+        run(args.scales, args.repeat, args.output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
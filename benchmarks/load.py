@@ -0,0 +1,293 @@
+"""Uji beban: banyak sesi bersamaan menjalankan skrip interaksi di keempat halaman.
+
+Setiap kombinasi (skenario cache, jumlah pengguna) diukur di subprocess baru.
+Satu pengguna virtual = satu sesi AppTest di thread sendiri yang memutar skrip
+interaksi keempat halaman (mulai dari halaman yang berbeda per pengguna):
+buka halaman, ganti mode peta & indikator, klik wilayah, filter/cari/halaman
+tabel, ganti variabel & dimensi analisis, wilayah acuan, rentang ambang, dst.
+Dilaporkan: persentil latensi per interaksi, throughput (interaksi/detik) dan RSS.
+
+Skenario cache:
+    cold  proses baru, sesi langsung datang (warm-up & cache masih kosong;
+          langkah "buka" pertama termasuk menunggu dataset siap)
+    warm  warm-up ditunggu dan setiap skrip dijalankan sekali sebelum diukur
+
+Catatan: AppTest selalu menjalankan ulang seluruh skrip, termasuk untuk
+interaksi di dalam fragment (peta, tabel), jadi latensi di sini batas atas
+dibanding server sungguhan. Klik peta disimulasikan dengan membungkus
+st_folium: ``last_active_drawing`` diisi fitur GeoJSON dari peta itu, seperti
+layer.toGeoJSON() di komponen aslinya.
+
+Pemakaian:
+    python -m benchmarks.load
+    python -m benchmarks.load --users 1 10 25 --rounds 3 --cache warm
+    python -m benchmarks.load --rows 5000 --think 0.5 --output hasil.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.memory import PeakSampler, rss_mb, shared_runtime, synthetic_dataset_file
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USERS = [1, 10, 25]
+CACHE_SCENARIOS = ["cold", "warm"]
+PERCENTILES = [50, 90, 99]
+CLICK_STATE = "_load_click"
+
+DASHBOARD = "🏠 Dashboard Utama"
+ANALYSIS = "📊 Analisis Karakteristik"
+METADATA = "📚 Metadata & Definisi"
+ABOUT = "ℹ️ Tentang Metode"
+
+
+def widget(at, kind, label):
+    return next(w for w in getattr(at, kind) if w.label == label)
+
+
+def cycle(options, n):
+    """Pilihan ke-n (berputar) selain None, agar tiap pengguna & putaran berbeda"""
+    options = [o for o in options if o is not None]
+    return options[n % len(options)]
+
+
+def open_page(page):
+    def step(at, n):
+        if at.radio:
+            at.radio(key="menu").set_value(page)
+        else:
+            at.session_state["menu"] = page
+        at.run()
+        # Sesi yang datang sebelum dataset siap melihat status warm-up: tunggu lalu rerun
+        if not at.radio:
+            from geoai import warmup
+            warmup.start().wait()
+            at.run()
+    return step
+
+
+def set_widget(kind, label, value):
+    def step(at, n):
+        w = widget(at, kind, label)
+        w.set_value(value(w, n) if callable(value) else value)
+        at.run()
+    return step
+
+
+def click_region(at, n):
+    at.session_state[CLICK_STATE] = n
+    at.run()
+    # Klik yang tidak sampai ke panel detail dihitung error, bukan latensi
+    if not any(h.value.startswith("📍") for h in at.subheader):
+        raise AssertionError("panel detail wilayah tidak muncul")
+
+
+def table_page(at, n):
+    w = at.number_input(key="table_page")
+    w.set_value(1 + n % int(w.max))
+    at.run()
+
+
+SCRIPTS = {
+    DASHBOARD: [
+        ("buka", open_page(DASHBOARD)),
+        ("mode variabel", set_widget("radio", "Mode Tampilan:", lambda w, n: w.options[1])),
+        ("ganti indikator", set_widget("selectbox", "Pilih Indikator:", lambda w, n: cycle(w.options, n + 1))),
+        ("klik wilayah", click_region),
+        ("mode klaster", set_widget("radio", "Mode Tampilan:", lambda w, n: w.options[0])),
+        ("filter klaster", set_widget("selectbox", "Filter Klaster:", lambda w, n: cycle(w.options[1:], n))),
+        ("cari wilayah", set_widget("text_input", "Cari wilayah:", lambda w, n: "a" if n % 2 else "")),
+        ("filter semua", set_widget("selectbox", "Filter Klaster:", "Semua")),
+        ("halaman tabel", table_page),
+    ],
+    ANALYSIS: [
+        ("buka", open_page(ANALYSIS)),
+        ("ganti variabel", set_widget("selectbox", "Pilih Variabel:", lambda w, n: cycle(w.options, n + 1))),
+        ("semua titik", set_widget("checkbox", "Tampilkan semua titik", lambda w, n: not w.value)),
+        ("ganti dimensi", set_widget("selectbox", "Pilih Dimensi:", lambda w, n: cycle(w.options, n + 1))),
+        ("wilayah acuan", set_widget("selectbox", "Wilayah acuan:", lambda w, n: cycle(w.options, n))),
+        ("ruang indikator", set_widget("selectbox", "Ruang indikator:", lambda w, n: cycle(w.options, n + 1))),
+        ("rentang ambang", set_widget("slider", "Rentang ambang Z:", lambda w, n: (0.05, 0.5 + 0.05 * (n % 10)))),
+    ],
+    METADATA: [
+        ("buka", open_page(METADATA)),
+        ("ganti background", set_widget("selectbox", "Ganti Background Peta:", lambda w, n: cycle(w.options, n))),
+    ],
+    ABOUT: [
+        ("buka", open_page(ABOUT)),
+    ],
+}
+
+
+def patch_map_clicks():
+    """Bungkus st_folium (sebelum views.dashboard mengimpornya) agar klik bisa disimulasikan.
+
+    Sesi dengan ``session_state[CLICK_STATE] = n`` menerima fitur ke-n peta yang
+    dirender sebagai ``last_active_drawing``, seperti klik di browser, dan hanya
+    jika field itu diminta lewat ``returned_objects`` (komponen aslinya juga
+    hanya mengembalikan field yang diminta).
+    """
+    import folium
+    import streamlit as st
+    import streamlit_folium
+
+    real = streamlit_folium.st_folium
+
+    def st_folium(m, *args, **kwargs):
+        result = real(m, *args, **kwargs)
+        n = st.session_state.get(CLICK_STATE)
+        returned = kwargs.get("returned_objects")
+        if n is None or (returned is not None and "last_active_drawing" not in returned):
+            return result
+        features = [f for child in m._children.values() if isinstance(child, folium.GeoJson)
+                    for f in child.data.get("features", [])]
+        if not features:
+            return result
+        feature = features[n % len(features)]
+        drawing = {"type": "Feature", "properties": dict(feature["properties"]), "geometry": feature.get("geometry")}
+        return {**(result or {}), "last_active_drawing": drawing}
+
+    streamlit_folium.st_folium = st_folium
+
+
+def page_order(start):
+    pages = list(SCRIPTS)
+    i = start % len(pages)
+    return pages[i:] + pages[:i]
+
+
+def run_script(at, page, n, record, think=0.0):
+    for name, step in SCRIPTS[page]:
+        error = None
+        t0 = time.perf_counter()
+        try:
+            step(at, n)
+            if at.exception:
+                error = at.exception[0].value
+        except Exception as e:
+            error = repr(e)
+        record({"page": page.split(" ", 1)[1], "step": name, "seconds": time.perf_counter() - t0, "error": error})
+        if think:
+            time.sleep(think)
+
+
+def virtual_user(app, user, rounds, record, think=0.0):
+    """Satu sesi: ``rounds`` kali memutar skrip keempat halaman, mulai dari halaman ke-``user``"""
+    from benchmarks.memory import new_session
+
+    order = page_order(user)
+    at = new_session(app, order[0])
+    for r in range(rounds):
+        for page in order:
+            run_script(at, page, user + r, record, think)
+
+
+def summarize(samples):
+    import numpy as np
+
+    ms = np.array([s["seconds"] for s in samples]) * 1000
+    summary = {f"p{p}_ms": float(np.percentile(ms, p)) for p in PERCENTILES}
+    return {"n": len(samples), **summary, "max_ms": float(ms.max())}
+
+
+def child(app, scenario, users, rounds, think):
+    """Dijalankan di subprocess: satu skenario cache x jumlah pengguna, hasil JSON ke stdout"""
+    from benchmarks.memory import new_session
+
+    app = os.path.abspath(app)
+    sys.path.insert(0, os.path.dirname(app))
+    patch_map_clicks()
+    if scenario == "warm":
+        for page in SCRIPTS:
+            run_script(new_session(app, page), page, 0, lambda sample: None)
+        from geoai import warmup
+        warmup.start().wait()
+    baseline = rss_mb()
+
+    samples = []
+    t0 = time.perf_counter()
+    with PeakSampler() as sampler, shared_runtime(), ThreadPoolExecutor(users) as pool:
+        list(pool.map(lambda u: virtual_user(app, u, rounds, samples.append, think), range(users)))
+    seconds = time.perf_counter() - t0
+
+    steps = {}
+    for s in samples:
+        steps.setdefault(f"{s['page']} / {s['step']}", []).append(s)
+    errors = [s for s in samples if s["error"]]
+    print(json.dumps({
+        "scenario": scenario,
+        "users": users,
+        "rounds": rounds,
+        "think_seconds": think,
+        "seconds": seconds,
+        "throughput": len(samples) / seconds,
+        "baseline_mb": baseline,
+        "peak_mb": sampler.peak,
+        "steady_mb": rss_mb(),
+        "latency": summarize(samples),
+        "steps": {name: summarize(group) for name, group in steps.items()},
+        "errors": len(errors),
+        "error_samples": sorted({f"{s['page']} / {s['step']}: {s['error']}" for s in errors})[:5],
+    }, ensure_ascii=False))
+
+
+def measure(app, scenario, users, rounds, think, env):
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", scenario, "--users", str(users),
+         "--rounds", str(rounds), "--think", str(think), "--app", app],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(app)),
+        env={**os.environ, "PYTHONWARNINGS": "ignore", "PYTHONPATH": ROOT_DIR, **env},
+    )
+    lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(proc.stderr[-2000:])
+    return json.loads(lines[-1])
+
+
+def report(r):
+    lat = r["latency"]
+    print(f"{r['scenario']:<5}{r['users']:>4} pengguna  {lat['n']:>5} interaksi  {r['seconds']:>6.1f} s  "
+          f"{r['throughput']:>6.1f}/s  p50 {lat['p50_ms']:>6.0f}  p90 {lat['p90_ms']:>6.0f}  p99 {lat['p99_ms']:>6.0f} ms  "
+          f"RSS {r['baseline_mb']:.0f} -> puncak {r['peak_mb']:.0f} MB  {r['errors']} error")
+    for name, s in r["steps"].items():
+        print(f"      {name:<42} p50 {s['p50_ms']:>6.0f}  p90 {s['p90_ms']:>6.0f}  p99 {s['p99_ms']:>6.0f}  max {s['max_ms']:>6.0f} ms")
+    for e in r["error_samples"]:
+        print(f"      error: {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Uji beban sesi bersamaan: latensi per interaksi, throughput & RSS")
+    parser.add_argument("--app", default=os.path.join(ROOT_DIR, "app.py"))
+    parser.add_argument("--users", type=int, nargs="+", default=USERS)
+    parser.add_argument("--cache", nargs="+", choices=CACHE_SCENARIOS, default=CACHE_SCENARIOS)
+    parser.add_argument("--rounds", type=int, default=2, help="putaran skrip keempat halaman per pengguna")
+    parser.add_argument("--think", type=float, default=0.0, help="jeda antar interaksi (detik)")
+    parser.add_argument("--rows", type=int, help="wilayah per tahun untuk data panel sintetis")
+    parser.add_argument("--output")
+    parser.add_argument("--child", choices=CACHE_SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        return child(args.app, args.child, args.users[0], args.rounds, args.think)
+
+    env = {}
+    if args.rows:
+        env["GEOAI_DATASET"] = synthetic_dataset_file(args.rows, tempfile.gettempdir())
+
+    results = []
+    for scenario in args.cache:
+        for users in args.users:
+            r = measure(args.app, scenario, users, args.rounds, args.think, env)
+            results.append(r)
+            report(r)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""RSS per sesi pada 1, 10 & 50 sesi bersamaan dalam satu proses server.
+
+Setiap jumlah sesi diukur di subprocess baru: warm-up ditunggu dan satu sesi
+pemanasan dijalankan (modul & cache terisi), lalu N sesi AppTest membuka
+halaman yang sama secara bersamaan (thread) dan tetap hidup. Yang dilaporkan:
+RSS puncak selama N rerun berjalan bersamaan dan RSS setelahnya, masing-masing
+dikurangi baseline lalu dibagi N.
+
+Pemakaian:
+    python -m benchmarks.memory
+    python -m benchmarks.memory --sessions 1 10 50 --rows 5000 --output hasil.json
+    python -m benchmarks.memory --app path/ke/app.py     # bandingkan tree lain
+
+``--rows`` membangkitkan data panel sintetis (5 tahun) lewat GEOAI_DATASET;
+tanpa itu dataset bawaan yang dipakai.
+"""
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SESSIONS = [1, 10, 50]
+PAGE = "🏠 Dashboard Utama"
+
+
+def rss_mb():
+    """RSS saat ini (bukan puncak) dari /proc/self/statm"""
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+
+
+class PeakSampler:
+    """Thread pencatat RSS maksimum selama blok ``with`` berjalan"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak = 0.0
+        self._stop = threading.Event()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, rss_mb())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_mb())
+
+
+@contextlib.contextmanager
+def shared_runtime():
+    """Satu Runtime tiruan & satu patch config untuk semua AppTest yang berjalan bersamaan.
+
+    AppTest.run memasang lalu menghapus ``Runtime._instance`` global di setiap
+    run, sehingga run serentak saling mengosongkan runtime milik yang lain
+    ("Runtime hasn't been created!"). Selama blok ini, runtime terakhir yang
+    terlihat dipakai sebagai cadangan; server sungguhan juga hanya punya satu.
+    Begitu pula patch ``global.appTest`` per run (config.get_option global)
+    yang saling menimpa: dipasang sekali untuk seluruh blok. Skrip app
+    dikompilasi sekali lewat satu ScriptCache bersama seperti di server;
+    compile() serentak tidak aman di Python 3.11.
+    """
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+    from streamlit.testing.v1.util import patch_config_options
+
+    seen = []
+    original = Runtime.__dict__["instance"], Runtime.__dict__["exists"]
+
+    def instance(cls):
+        if cls._instance is not None:
+            seen[:] = [cls._instance]
+        if not seen:
+            raise RuntimeError("Runtime hasn't been created!")
+        return seen[0]
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or bool(seen))
+    app_test.patch_config_options = lambda overrides: contextlib.nullcontext()
+    script_cache = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+    try:
+        with patch_config_options({"global.appTest": True}):
+            yield
+    finally:
+        Runtime.instance, Runtime.exists = original
+        app_test.patch_config_options = patch_config_options
+        app_test.ScriptCache = local_script_runner.ScriptCache = ScriptCache
+
+
+def new_session(app, page):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app, default_timeout=600)
+    at.session_state["menu"] = page
+    return at
+
+
+def child(app, page, n):
+    """Dijalankan di subprocess: N sesi bersamaan, hasil JSON ke stdout"""
+    app = os.path.abspath(app)
+    sys.path.insert(0, os.path.dirname(app))
+    first = new_session(app, page).run()
+    try:
+        from geoai import warmup
+        warmup.start().wait()
+    except ImportError:
+        pass  # tree tanpa warm-up
+    first.run()
+    baseline = rss_mb()
+
+    sessions = [new_session(app, page) for _ in range(n)]
+    t0 = time.perf_counter()
+    with PeakSampler() as sampler, shared_runtime(), ThreadPoolExecutor(n) as pool:
+        list(pool.map(lambda at: at.run(), sessions))
+    seconds = time.perf_counter() - t0
+    steady = rss_mb()
+    print(json.dumps({
+        "sessions": n,
+        "baseline_mb": baseline,
+        "peak_mb": sampler.peak,
+        "steady_mb": steady,
+        "peak_per_session_mb": (sampler.peak - baseline) / n,
+        "steady_per_session_mb": (steady - baseline) / n,
+        "seconds": seconds,
+        "exceptions": sum(bool(at.exception) for at in sessions),
+    }))
+
+
+def synthetic_dataset_file(rows, directory):
+    """Panel sintetis 5 tahun x ``rows`` wilayah sebagai xlsx"""
+    from benchmarks.hotpaths import synthetic_panel
+
+    path = os.path.join(directory, f"panel_{rows}.xlsx")
+    if not os.path.exists(path):
+        synthetic_panel(rows).to_excel(path, index=False)
+    return path
+
+
+def measure(app, page, n, env):
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", str(n), "--app", app, "--page", page],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(app)),
+        env={**os.environ, "PYTHONWARNINGS": "ignore", "PYTHONPATH": ROOT_DIR, **env},
+    )
+    lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(proc.stderr[-2000:])
+    return json.loads(lines[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSS per sesi pada beberapa jumlah sesi bersamaan")
+    parser.add_argument("--app", default=os.path.join(ROOT_DIR, "app.py"))
+    parser.add_argument("--page", default=PAGE)
+    parser.add_argument("--sessions", type=int, nargs="+", default=SESSIONS)
+    parser.add_argument("--rows", type=int, help="wilayah per tahun untuk data panel sintetis")
+    parser.add_argument("--output")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        return child(args.app, args.page, args.child)
+
+    env = {}
+    if args.rows:
+        env["GEOAI_DATASET"] = synthetic_dataset_file(args.rows, tempfile.gettempdir())
+
+    results = []
+    for n in args.sessions:
+        r = measure(args.app, args.page, n, env)
+        results.append(r)
+        print(f"{n:>3} sesi  baseline {r['baseline_mb']:>6.0f} MB  puncak +{r['peak_per_session_mb']:>6.2f} MB/sesi  "
+              f"setelah +{r['steady_per_session_mb']:>6.2f} MB/sesi  ({r['seconds']:.1f} s, {r['exceptions']} error)")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Biaya render pertama per halaman di proses baru: waktu import, total waktu & RSS.
+
+Setiap halaman dijalankan di subprocess terpisah (``-X importtime``) lewat
+Streamlit AppTest dengan pilihan menu di session_state, sehingga yang terukur
+adalah proses server yang baru start lalu langsung membuka halaman itu
+(termasuk menunggu warm-up jika dataset belum siap).
+
+Pemakaian:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --app path/ke/app.py --output hasil.json
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["🏠 Dashboard Utama", "📊 Analisis Karakteristik", "📚 Metadata & Definisi", "ℹ️ Tentang Metode"]
+HEAVY_MODULES = ["geopandas", "shapely", "folium", "streamlit_folium", "plotly.express", "sklearn", "pyarrow", "pandas"]
+MARKER = "-- geoai startup: render --"
+
+
+def _rss_mb():
+    # ru_maxrss dalam KB di Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(app, page):
+    """Dijalankan di subprocess: render pertama satu halaman, hasil JSON ke stdout"""
+    from streamlit.testing.v1 import AppTest
+
+    before = set(sys.modules)
+    rss0 = _rss_mb()
+    print(MARKER, file=sys.stderr, flush=True)
+    t0 = time.perf_counter()
+    at = AppTest.from_file(app, default_timeout=300)
+    at.session_state["menu"] = page
+    at.run()
+    # Render pertama bisa berupa status warm-up (dataset belum siap): tunggu lalu rerun
+    from geoai import warmup
+    if not at.radio:
+        warmup.start().wait()
+        at.run()
+    seconds = time.perf_counter() - t0
+    print(json.dumps({
+        "page": page,
+        "seconds": seconds,
+        "rss_mb": _rss_mb(),
+        "rss_delta_mb": _rss_mb() - rss0,
+        "heavy_modules": [m for m in HEAVY_MODULES if m in sys.modules and m not in before],
+        "exception": [str(e.value) for e in at.exception],
+    }))
+
+
+def import_seconds(stderr):
+    """Jumlah waktu import (self) setelah MARKER dari output -X importtime"""
+    total, started = 0, False
+    for line in stderr.splitlines():
+        if line.startswith(MARKER):
+            started = True
+        elif started and line.startswith("import time:") and "|" in line:
+            self_us = line.split(":", 1)[1].split("|")[0].strip()
+            if self_us.isdigit():
+                total += int(self_us)
+    return total / 1e6
+
+
+def measure(app, page):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "benchmarks.startup", "--child", page, "--app", app],
+        capture_output=True, text=True, cwd=ROOT_DIR, env={**os.environ, "PYTHONWARNINGS": "ignore"},
+    )
+    lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(proc.stderr[-2000:])
+    result = json.loads(lines[-1])
+    result["import_seconds"] = import_seconds(proc.stderr)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Waktu import & RSS render pertama per halaman")
+    parser.add_argument("--app", default=os.path.join(ROOT_DIR, "app.py"))
+    parser.add_argument("--output")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        return child(args.app, args.child)
+
+    results = []
+    for page in PAGES:
+        r = measure(args.app, page)
+        results.append(r)
+        print(f"{page:<28}{r['seconds']:>7.2f} s  import {r['import_seconds']:>5.2f} s  "
+              f"RSS {r['rss_mb']:>5.0f} MB  {', '.join(r['heavy_modules']) or '-'}")
+        if r["exception"]:
+            print(f"  exception: {r['exception']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
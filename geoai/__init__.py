@@ -0,0 +1 @@
+"""Modul pendukung Dashboard GeoAI Ketahanan Pangan."""
@@ -0,0 +1,105 @@
+"""Analisis Z-Score simbolik (✅/⚠️/❌) per klaster & noise, versi vektor.
+
+Semua sinyal indikator dihitung sekaligus sebagai satu operasi array NumPy,
+lalu suara per dimensi DIMENSI_DICT didapat dari perkalian matriks sinyal
+dengan matriks keanggotaan dimensi. Hasil di-memo berdasarkan hash isi frame.
+"""
+import numpy as np
+import pandas as pd
+
+from geoai.cache import LRUCache, frame_version
+from geoai.metadata import CLEAN_VARS_LIST, DIMENSI_DICT, INDIKATOR_NEGATIF
+
+# Batas "sekitar rata-rata" pada skala Z
+THRESHOLD = 0.3
+
+# Indeks simbol = sinyal + 1 (sinyal -1 / 0 / +1)
+SYMBOLS = np.array(["❌", "⚠️", "✅"], dtype=object)
+
+_memo = LRUCache(maxsize=16)
+
+
+def standardize(values):
+    """Z-score per kolom, setara StandardScaler (ddof=0, NaN diabaikan, std 0 -> 1)"""
+    values = np.asarray(values, dtype=np.float64)
+    mean = np.nanmean(values, axis=0)
+    std = np.sqrt(np.nanvar(values, axis=0))
+    std[std < 10 * np.finfo(np.float64).eps] = 1.0
+    return (values - mean) / std
+
+
+def indicator_signals(z, negative, threshold=THRESHOLD):
+    """Sinyal -1/0/+1 per sel (n, k); indikator negatif dibalik tandanya"""
+    sig = (z >= threshold).astype(np.int8) - (z <= -threshold).astype(np.int8)
+    return np.where(negative, -sig, sig)
+
+
+def dimension_matrix(var_cols, dimensions=DIMENSI_DICT):
+    """Matriks keanggotaan (k indikator x d dimensi)"""
+    return np.array([[v in vars_ for vars_ in dimensions.values()] for v in var_cols], dtype=np.int8).reshape(len(var_cols), len(dimensions))
+
+
+def dimension_votes(signals, membership):
+    """Voting mayoritas per dimensi: jumlah ✅ dikurangi jumlah ❌"""
+    return np.sign(signals.astype(np.int32) @ membership)
+
+
+def _profiles(df):
+    """Z-score rata-rata per klaster (urut id) + Z-score tiap provinsi noise"""
+    var_cols = [c for c in CLEAN_VARS_LIST if c in df.columns]
+    z = standardize(df[var_cols].to_numpy())
+    cluster = df['Cluster'].to_numpy()
+    provinsi = df['Provinsi'].to_numpy()
+
+    normal = cluster != -1
+    z_normal = pd.DataFrame(z[normal], columns=var_cols)
+    grouped = z_normal.groupby(cluster[normal]).mean()
+    members = pd.Series(provinsi[normal]).groupby(cluster[normal]).agg(lambda s: ", ".join(sorted(s)))
+
+    noise = ~normal
+    return var_cols, grouped, members, z[noise], provinsi[noise]
+
+
+def _stack(grouped, z_noise):
+    # Satu array profil: baris klaster diikuti baris noise
+    if not len(grouped.columns):
+        return np.empty((len(grouped) + len(z_noise), 0))
+    return np.vstack([grouped.to_numpy(), z_noise])
+
+
+def profile_matrix(df):
+    """(profil Z: baris klaster urut id lalu tiap provinsi noise, var_cols, label baris)"""
+    var_cols, grouped, _, z_noise, noise_names = _profiles(df)
+    labels = [f"Klaster {cid}" for cid in grouped.index] + [f"Noise: {p}" for p in noise_names]
+    return _stack(grouped, z_noise), var_cols, labels
+
+
+def _compute(df):
+    var_cols, grouped, members, z_noise, noise_names = _profiles(df)
+    negative = np.array([c in INDIKATOR_NEGATIF for c in var_cols], dtype=bool)
+    membership = dimension_matrix(var_cols)
+    has_vars = membership.any(axis=0)
+
+    profiles = _stack(grouped, z_noise)
+    votes = dimension_votes(indicator_signals(profiles, negative), membership)
+    verdicts = np.where(has_vars, SYMBOLS[votes + 1], "-")
+
+    n_clusters = len(grouped)
+    if n_clusters + len(noise_names) == 0:
+        return pd.DataFrame()
+
+    result = pd.DataFrame({
+        "Klaster": [f"Klaster {cid}" for cid in grouped.index] + ["Noise (Outlier)"] * len(noise_names),
+        "Tipe": ["Kelompok"] * n_clusters + [f"Provinsi: {p}" for p in noise_names],
+    })
+    for j, dim in enumerate(DIMENSI_DICT):
+        result[dim] = verdicts[:, j]
+    result['Anggota'] = list(members.reindex(grouped.index)) + list(noise_names)
+    return result
+
+
+def generate_emoji_analysis(df_input):
+    """Fungsi Analisis Z-Score Simbolik (di-memo per isi frame)"""
+    cols = [c for c in ['Provinsi', 'Cluster'] + CLEAN_VARS_LIST if c in df_input.columns]
+    key = frame_version(df_input[cols])
+    return _memo.get_or_build(key, lambda: _compute(df_input)).copy()
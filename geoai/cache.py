@@ -0,0 +1,207 @@
+"""Utilitas cache: hash isi DataFrame, cache LRU berbatas & cache disk bersama.
+
+Semua cache punya antarmuka yang sama (``get_or_build``, ``clear``,
+``stats``). ``DiskCache`` menyimpan nilai (pickle) di direktori yang bisa
+dibagi antar proses/replika (volume bersama), berkunci hash isi input, ditulis
+atomik, dan dibatasi total ukurannya (entri paling lama tidak dipakai dibuang
+dulu). ``make_cache`` memilih memori saja atau memori + disk dari env
+GEOAI_CACHE_DIR / GEOAI_CACHE_MAX_MB. Isi direktori cache di-unpickle, jadi
+hanya arahkan ke volume yang dipercaya.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# Naikkan jika bentuk nilai yang di-cache berubah agar entri disk lama diabaikan
+CACHE_VERSION = 1
+DEFAULT_MAX_MB = 1024
+
+
+def frame_version(df):
+    """Hash isi DataFrame, dipakai sebagai versi dataset pada key cache"""
+    h = hashlib.sha1(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    h.update(",".join(map(str, df.columns)).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def geometry_version(gdf):
+    """Hash isi geometri (WKB) + Provinsi_Key"""
+    import shapely
+
+    h = hashlib.sha1(b"".join(shapely.to_wkb(gdf.geometry.values)))
+    h.update("|".join(map(str, gdf['Provinsi_Key'])).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+class LRUCache:
+    """Cache LRU berbatas (thread-safe) dengan penghitung hit/miss"""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, builder):
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+            self.misses += 1
+
+        value = builder()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+
+class DiskCache:
+    """Cache pickle di disk berkunci hash; aman dibaca/ditulis banyak proses sekaligus"""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = self._scan_size()
+
+    def path(self, key):
+        digest = hashlib.sha256(repr((CACHE_VERSION, key)).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.pkl")
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".pkl"):
+                    yield os.path.join(root, name)
+
+    def _scan_size(self):
+        total = 0
+        for p in self._entries():
+            try: total += os.path.getsize(p)
+            except OSError: pass
+        return total
+
+    def get(self, key):
+        """Nilai tersimpan atau None; entri rusak/terhapus dianggap miss"""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        try: os.utime(path)  # tandai baru dipakai (urutan eviction)
+        except OSError: pass
+        return value
+
+    def put(self, key, value):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp): os.remove(tmp)
+            raise
+        with self._lock:
+            self._size += size
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self, target=0.9):
+        """Hapus entri paling lama tidak dipakai sampai ukuran <= target x max_bytes"""
+        entries = []
+        for p in self._entries():
+            try:
+                st = os.stat(p)
+                entries.append((st.st_mtime, st.st_size, p))
+            except OSError:
+                pass
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes * target:
+                break
+            try:
+                os.remove(p)
+                total -= size
+            except OSError:
+                pass
+        with self._lock:
+            self._size = total
+
+    def get_or_build(self, key, builder):
+        value = self.get(key)
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = builder()
+        if value is not None:  # None (mis. fetch gagal) tidak disimpan
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        for p in list(self._entries()):
+            try: os.remove(p)
+            except OSError: pass
+        with self._lock:
+            self._size = 0
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "bytes": self._size, "max_bytes": self.max_bytes}
+
+
+class TieredCache:
+    """LRU di memori di depan DiskCache: hit memori tanpa unpickle, miss memori dicoba dari disk"""
+
+    def __init__(self, memory, disk):
+        self.memory = memory
+        self.disk = disk
+
+    def get_or_build(self, key, builder):
+        return self.memory.get_or_build(key, lambda: self.disk.get_or_build(key, builder))
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+
+    def stats(self):
+        return {"memory": self.memory.stats(), "disk": self.disk.stats()}
+
+
+def make_cache(maxsize=32, directory=None, max_mb=None):
+    """LRUCache, atau TieredCache jika direktori cache disk (arg / GEOAI_CACHE_DIR) diberikan"""
+    directory = directory or os.environ.get("GEOAI_CACHE_DIR")
+    memory = LRUCache(maxsize)
+    if not directory:
+        return memory
+    max_mb = max_mb or float(os.environ.get("GEOAI_CACHE_MAX_MB", DEFAULT_MAX_MB))
+    return TieredCache(memory, DiskCache(directory, int(max_mb * 1024 * 1024)))
@@ -0,0 +1,103 @@
+"""Grafik Plotly halaman Analisis Karakteristik (dipakai app & ekspor statis).
+
+Box plot & profil dibaca dari kubus statistik (``geoai/stats.py``), bukan
+dari frame mentah; titik per wilayah hanya dikirim jika diminta. Heatmap
+sensitivitas ambang dibaca dari ThresholdSweep (``geoai/sensitivity.py``).
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from geoai.analysis import SYMBOLS
+from geoai.metadata import DIMENSI_DICT
+from geoai.stats import cluster_cube, cluster_means
+
+
+def distribution_figure(df, var, cube=None, show_points=False):
+    """Box plot sebaran satu indikator per klaster.
+
+    Default: kotak dari statistik kubus + titik outlier saja. ``show_points``
+    mengirim semua titik (px.box dari frame mentah, seperti sebelumnya).
+    """
+    title = f"Distribusi {var}"
+    if show_points:
+        return px.box(
+            df, x="Cluster_Label", y=var, color="Cluster_Label",
+            points="all", hover_data=["Provinsi"], title=title
+        )
+
+    cube = cluster_cube(df) if cube is None else cube
+    stats = cube.xs(var, level='Indikator')
+    colors = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for i, (label, row) in enumerate(stats.iterrows()):
+        color = colors[i % len(colors)]
+        fig.add_trace(go.Box(
+            name=label, x=[label], q1=[row['q1']], median=[row['median']], q3=[row['q3']],
+            lowerfence=[row['lowerfence']], upperfence=[row['upperfence']],
+            boxpoints=False, marker_color=color, legendgroup=label,
+        ))
+        if row['outliers']:
+            names, values = zip(*row['outliers'])
+            fig.add_trace(go.Scatter(
+                x=[label] * len(values), y=values, mode="markers", text=names, name=label,
+                marker_color=color, legendgroup=label, showlegend=False,
+                hovertemplate="%{text}<br>%{y}<extra></extra>",
+            ))
+    fig.update_layout(title=title, xaxis_title="Cluster_Label", yaxis_title=var, legend_title_text="Cluster_Label")
+    return fig
+
+
+def profile_figure(df, dim, selected_outliers=(), cube=None):
+    """Rata-rata indikator satu dimensi per klaster utama (+ outlier terpilih). None jika dimensi kosong."""
+    vars_in_dim = [v for v in DIMENSI_DICT[dim] if v in df.columns]
+    if not vars_in_dim:
+        return None
+
+    cube = cluster_cube(df) if cube is None else cube
+    main_labels = df.loc[df['Cluster'] != -1, 'Cluster_Label'].unique()
+    avg_df = cluster_means(cube, main_labels, vars_in_dim).rename_axis("Cluster_Label").reset_index()
+    if selected_outliers:
+        df_noise = df[df['Cluster'] == -1]
+        noise_data = df_noise[df_noise['Provinsi'].isin(selected_outliers)][['Provinsi'] + vars_in_dim]
+        noise_data = noise_data.rename(columns={'Provinsi': 'Cluster_Label'})
+        final_plot_df = pd.concat([avg_df, noise_data], ignore_index=True)
+    else:
+        final_plot_df = avg_df
+
+    final_melt = final_plot_df.melt(id_vars="Cluster_Label", var_name="Indikator", value_name="Nilai")
+    return px.bar(
+        final_melt, x="Indikator", y="Nilai", color="Cluster_Label",
+        barmode="group", title=f"Profil {dim}"
+    )
+
+
+def stability_figure(sweep, rows):
+    """Heatmap profil x dimensi: porsi grid ambang yang verdict-nya sama dengan verdict ambang acuan"""
+    frame = sweep.stability_frame(rows)
+    text = SYMBOLS[sweep.baseline[rows] + 1].astype(object) + np.where(sweep.flips[rows] > 0, " ⇄", "")
+    fig = go.Figure(go.Heatmap(
+        z=frame.to_numpy(), x=frame.columns, y=frame.index, text=text, texttemplate="%{text}",
+        zmin=0, zmax=1, colorscale="RdYlGn", colorbar_title="Stabil",
+        hovertemplate="%{y}<br>%{x}<br>verdict sama di %{z:.0%} grid<extra></extra>",
+    ))
+    fig.update_layout(title=f"Stabilitas verdict (acuan ambang {sweep.threshold:g}; ⇄ = berubah di grid)",
+                      height=max(300, 40 + 24 * len(rows)), yaxis_autorange="reversed")
+    return fig
+
+
+def sweep_figure(sweep, dim, rows):
+    """Heatmap profil x ambang untuk satu dimensi: verdict ❌/⚠️/✅ di setiap ambang grid"""
+    j = sweep.dimensions.index(dim)
+    codes = sweep.codes[:, rows, j].T
+    labels = np.asarray(sweep.labels, dtype=object)[rows]
+    fig = go.Figure(go.Heatmap(
+        z=codes, x=[f"{t:g}" for t in sweep.thresholds], y=labels, text=SYMBOLS[codes + 1],
+        zmin=-1, zmax=1, colorscale=[[0, "#d62728"], [0.5, "#ffdd57"], [1, "#2ca02c"]], showscale=False,
+        hovertemplate="%{y}<br>ambang %{x}: %{text}<extra></extra>",
+    ))
+    fig.add_vline(x=sweep.thresholds.tolist().index(sweep.threshold), line_dash="dash")
+    fig.update_layout(title=f"Verdict {dim} per ambang", xaxis_title="Ambang Z",
+                      height=max(300, 40 + 24 * len(rows)), yaxis_autorange="reversed")
+    return fig
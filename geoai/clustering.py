@@ -0,0 +1,184 @@
+"""Mesin re-klaster t-SNE + DBSCAN dengan sweep parameter di process pool.
+
+Embedding t-SNE hanya bergantung pada perplexity, jadi satu tugas pool
+menghitung satu embedding lalu menjalankan DBSCAN untuk semua kombinasi
+(eps, min_samples). Setiap run disimpan di cache berkunci
+(versi data, perplexity, eps, min_samples, random_state) sehingga dashboard
+bisa berpindah ke run mana pun tanpa menghitung ulang.
+"""
+import itertools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from geoai.analysis import standardize
+from geoai.cache import frame_version
+from geoai.datastore import cluster_labels
+from geoai.metadata import CLEAN_VARS_LIST
+
+DEFAULT_GRID = {
+    "perplexity": [5, 10, 15],
+    "eps": [1.0, 2.5, 5.0, 10.0, 15.0],
+    "min_samples": [2, 3, 4],
+}
+RANDOM_STATE = 42
+
+
+def feature_matrix(df):
+    """Matriks indikator (urutan CLEAN_VARS_LIST) yang dipakai pipeline"""
+    var_cols = [c for c in CLEAN_VARS_LIST if c in df.columns]
+    return df[var_cols].to_numpy(dtype=np.float64)
+
+
+def data_version(df):
+    """Versi data untuk key run: hash indikator + nama provinsi"""
+    var_cols = [c for c in CLEAN_VARS_LIST if c in df.columns]
+    return frame_version(df[['Provinsi'] + var_cols].reset_index(drop=True))
+
+
+def run_key(version, perplexity, eps, min_samples, random_state=RANDOM_STATE):
+    return (version, float(perplexity), float(eps), int(min_samples), int(random_state))
+
+
+def embed(X, perplexity, random_state=RANDOM_STATE):
+    """Standardisasi lalu t-SNE 2D (perplexity dibatasi < jumlah baris)"""
+    from sklearn.manifold import TSNE
+
+    z = np.nan_to_num(standardize(X))
+    perplexity = min(float(perplexity), len(z) - 1.0)
+    return TSNE(n_components=2, perplexity=perplexity, init="pca", random_state=random_state).fit_transform(z)
+
+
+def cluster_metrics(embedding, labels):
+    """Ringkasan kualitas run: jumlah klaster, rasio noise, silhouette & Davies-Bouldin"""
+    from sklearn.metrics import davies_bouldin_score, silhouette_score
+
+    core = labels != -1
+    n_clusters = len(set(labels[core].tolist()))
+    metrics = {"n_clusters": n_clusters, "noise_ratio": float((~core).mean()),
+               "silhouette": None, "davies_bouldin": None}
+    # Skor hanya terdefinisi untuk >= 2 klaster (noise tidak dihitung)
+    if 2 <= n_clusters < core.sum():
+        metrics["silhouette"] = float(silhouette_score(embedding[core], labels[core]))
+        metrics["davies_bouldin"] = float(davies_bouldin_score(embedding[core], labels[core]))
+    return metrics
+
+
+def sweep_perplexity(X, perplexity, eps_values, min_samples_values, random_state=RANDOM_STATE):
+    """Tugas pool: satu embedding t-SNE, DBSCAN untuk semua (eps, min_samples)"""
+    from sklearn.cluster import DBSCAN
+
+    embedding = embed(X, perplexity, random_state)
+    runs = []
+    for eps, min_samples in itertools.product(eps_values, min_samples_values):
+        labels = DBSCAN(eps=eps, min_samples=min_samples).fit_predict(embedding)
+        runs.append({
+            "params": {"perplexity": float(perplexity), "eps": float(eps),
+                       "min_samples": int(min_samples), "random_state": int(random_state)},
+            "labels": labels.astype(np.int16),
+            "metrics": cluster_metrics(embedding, labels),
+        })
+    return runs
+
+
+def apply_run(df, run):
+    """Ganti kolom Cluster/Cluster_Label dengan label dari run"""
+    labels = np.asarray(run["labels"])
+    return df.assign(Cluster=labels, Cluster_Label=cluster_labels(labels).to_numpy())
+
+
+def describe_run(run):
+    """Label singkat untuk pilihan di UI"""
+    p, m = run["params"], run["metrics"]
+    sil = f"{m['silhouette']:.2f}" if m["silhouette"] is not None else "-"
+    return (f"perp={p['perplexity']:g} eps={p['eps']:g} min={p['min_samples']} | "
+            f"{m['n_clusters']} klaster, noise {m['noise_ratio']:.0%}, sil {sil}")
+
+
+class SweepJob:
+    """Satu sweep yang berjalan di background (kumpulan future per perplexity)"""
+
+    def __init__(self, futures, total_runs):
+        self.futures = futures
+        self.total_runs = total_runs
+        self.errors = []
+
+    @property
+    def done(self):
+        return all(f.done() for f in self.futures)
+
+    @property
+    def progress(self):
+        if not self.futures: return 1.0
+        return sum(f.done() for f in self.futures) / len(self.futures)
+
+
+class ClusterEngine:
+    """Cache hasil run + process pool untuk sweep parameter"""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+        self._runs = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            # spawn: aman dipakai dari proses server yang multi-thread
+            self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    def get(self, key):
+        with self._lock:
+            return self._runs.get(key)
+
+    def runs(self, version):
+        """Semua run untuk versi data ini, urut silhouette terbaik (silhouette tak terdefinisi di akhir)"""
+        with self._lock:
+            found = [(k, r) for k, r in self._runs.items() if k[0] == version]
+
+        def rank(kr):
+            score = kr[1]["metrics"]["silhouette"]
+            return (score is None, 0.0 if score is None else -score)
+        return sorted(found, key=rank)
+
+    def _store(self, version, job, future):
+        try:
+            runs = future.result()
+        except Exception as e:
+            job.errors.append(repr(e))
+            return
+        with self._lock:
+            for run in runs:
+                p = run["params"]
+                self._runs[run_key(version, p["perplexity"], p["eps"], p["min_samples"], p["random_state"])] = run
+
+    def sweep(self, df, grid=None, random_state=RANDOM_STATE):
+        """Mulai sweep di background; kombinasi yang sudah ada di cache dilewati"""
+        grid = {**DEFAULT_GRID, **(grid or {})}
+        version = data_version(df)
+        X = feature_matrix(df)
+
+        futures, total = [], 0
+        for perplexity in grid["perplexity"]:
+            todo = [(e, m) for e, m in itertools.product(grid["eps"], grid["min_samples"])
+                    if self.get(run_key(version, perplexity, e, m, random_state)) is None]
+            if not todo:
+                continue
+            eps_values = sorted({e for e, _ in todo})
+            min_samples_values = sorted({m for _, m in todo})
+            future = self._pool().submit(sweep_perplexity, X, perplexity, eps_values, min_samples_values, random_state)
+            futures.append(future)
+            total += len(eps_values) * len(min_samples_values)
+
+        job = SweepJob(futures, total)
+        for future in futures:
+            future.add_done_callback(lambda f, job=job: self._store(version, job, f))
+        return job
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,323 @@
+"""Dataset klaster dengan sidecar kolumnar (Arrow/Feather) di depan file Excel.
+
+Parsing xlsx lewat openpyxl adalah langkah cold start paling lambat. Hasil
+parse + validasi disimpan sekali ke ``data/cache/<nama>.feather`` (tanpa
+kompresi agar bisa di-memory-map) bersama metadata mtime, ukuran, dan hash
+SHA-256 file sumber. Sidecar dibangun ulang hanya jika isi xlsx berubah.
+
+Pemakaian:
+    python -m geoai.datastore convert [file.xlsx]
+"""
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from geoai.metadata import CLEAN_VARS_LIST, VAR_MAPPING
+from geoai.names import resolve_names
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_FILE = os.environ.get("GEOAI_DATASET") or os.path.join(ROOT_DIR, "Hasil_Clustering_Final.xlsx")
+CACHE_DIR = os.path.join(ROOT_DIR, "data", "cache")
+
+# Kolom opsional untuk data panel multi-tahun (satu baris per provinsi per tahun)
+YEAR_COLUMN = 'Tahun'
+
+# Naikkan jika isi/tipe kolom sidecar berubah agar sidecar lama dibangun ulang
+SCHEMA_VERSION = 3
+
+# Kolom teks yang dijadikan categorical jika nilainya banyak berulang. Nama wilayah
+# tetap teks (pandas 3: str berbasis Arrow, bukan objek Python) karena dipakai
+# sebagai key merge/replace dan agregasi list.
+CATEGORY_COLUMNS = ['Cluster_Label']
+
+
+class DatasetSchemaError(ValueError):
+    """Dataset tidak sesuai skema; ``problems`` berisi semua temuan"""
+
+    def __init__(self, source, problems):
+        self.source = source
+        self.problems = problems
+        super().__init__(f"{os.path.basename(source)}: " + "; ".join(problems))
+
+
+def cluster_labels(cluster):
+    """Label tampilan klaster (-1 = Noise)"""
+    cluster = pd.Series(cluster)
+    return pd.Series(
+        np.where(cluster == -1, "Noise (Outlier)", "Klaster " + cluster.astype(str)),
+        index=cluster.index,
+    )
+
+
+def validate_dataset(df, source="dataset"):
+    """Cek kolom wajib & tipe data. Raise DatasetSchemaError berisi semua masalah."""
+    problems = []
+    for col in ['Provinsi', 'Cluster']:
+        if col not in df.columns:
+            problems.append(f"kolom '{col}' tidak ada")
+
+    indicators = [c for c in CLEAN_VARS_LIST if c in df.columns]
+    if not indicators:
+        problems.append("tidak ada kolom indikator (X1-X14)")
+    for col in indicators:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            bad = df.loc[pd.to_numeric(df[col], errors='coerce').isna() & df[col].notna(), col]
+            problems.append(f"kolom '{col}' bukan numerik (contoh: {bad.head(3).tolist()})")
+
+    if YEAR_COLUMN in df.columns:
+        year = pd.to_numeric(df[YEAR_COLUMN], errors='coerce')
+        if year.isna().any() or (year % 1 != 0).any():
+            problems.append(f"kolom '{YEAR_COLUMN}' harus bilangan bulat tanpa nilai kosong")
+
+    if 'Cluster' in df.columns:
+        cluster = pd.to_numeric(df['Cluster'], errors='coerce')
+        if cluster.isna().any() or (cluster % 1 != 0).any():
+            problems.append("kolom 'Cluster' harus bilangan bulat tanpa nilai kosong")
+
+    if 'Provinsi' in df.columns:
+        if df['Provinsi'].isna().any():
+            problems.append(f"{int(df['Provinsi'].isna().sum())} baris tanpa nama Provinsi")
+        keys = resolve_names(df['Provinsi'].dropna())
+        # Data panel: provinsi boleh berulang, asal tidak dua kali di tahun yang sama
+        dup_mask = keys.duplicated().to_numpy()
+        if YEAR_COLUMN in df.columns:
+            years = df.loc[df['Provinsi'].notna(), YEAR_COLUMN].to_numpy()
+            dup_mask = pd.DataFrame({"year": years, "key": keys.to_numpy()}).duplicated().to_numpy()
+        dup = keys[dup_mask].unique().tolist()
+        if dup:
+            problems.append(f"Provinsi duplikat setelah normalisasi: {dup}")
+
+    if problems:
+        raise DatasetSchemaError(source, problems)
+
+
+def fits_float32(values):
+    """True jika semua nilai (selain NaN) tersimpan persis di float32.
+
+    Pembulatan desimal tidak cukup: 12.3 sebagai float32 tampil 12.300000190734863
+    di hover/tooltip/JSON, jadi hanya kolom yang round-trip-nya identik yang diperkecil
+    (mis. kolom bilangan bulat yang berisi sel kosong).
+    """
+    values = values[~np.isnan(values)]
+    return bool(len(values)) and np.array_equal(values.astype(np.float32).astype(np.float64), values)
+
+
+def compact_dtypes(df):
+    """Integer di-downcast, float32 jika nilainya persis, teks berulang jadi categorical"""
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_integer_dtype(s):
+            out[col] = pd.to_numeric(s, downcast='integer')
+        elif pd.api.types.is_float_dtype(s) and s.dtype != np.float32 and fits_float32(s.to_numpy(dtype=np.float64)):
+            out[col] = s.astype(np.float32)
+        elif col in CATEGORY_COLUMNS and not isinstance(s.dtype, pd.CategoricalDtype) and s.nunique() * 2 <= len(s):
+            out[col] = s.astype('category')
+    return df.assign(**out) if out else df
+
+
+def prepare_dataset(df, source="dataset"):
+    """Rename X1..X14, validasi, tambah Cluster_Label & Provinsi_Key, ringkas tipe data"""
+    if "X1" in df.columns: df = df.rename(columns=VAR_MAPPING)
+    validate_dataset(df, source)
+
+    df = df.copy()
+    if 'Cluster_Label' not in df.columns:
+        df['Cluster_Label'] = cluster_labels(df['Cluster'])
+    df['Provinsi_Key'] = resolve_names(df['Provinsi'])
+    return compact_dtypes(df)
+
+
+def shared_view(df):
+    """View dangkal tanpa salin data untuk satu sesi dari frame bersama per proses.
+
+    Dengan Copy-on-Write (selalu aktif di pandas 3) perubahan lewat view (kolom
+    baru, assign, setitem) hanya menyalin kolom yang diubah; frame bersama tidak
+    ikut berubah.
+    """
+    return df.copy(deep=False)
+
+
+def panel_years(df):
+    """Tahun yang tersedia (urut); list kosong jika dataset hanya satu potret"""
+    if YEAR_COLUMN not in df.columns:
+        return []
+    return sorted(int(y) for y in df[YEAR_COLUMN].unique())
+
+
+def year_snapshot(df, year=None):
+    """Baris satu tahun (default tahun terakhir); dataset tanpa kolom Tahun apa adanya"""
+    years = panel_years(df)
+    if not years:
+        return df
+    year = years[-1] if year is None else year
+    return df[df[YEAR_COLUMN] == year].reset_index(drop=True)
+
+
+def dummy_dataset():
+    """Data contoh jika file Excel tidak tersedia"""
+    provs = ["ACEH","SUMATERA UTARA","DKI JAKARTA","JAWA BARAT","JAWA TIMUR","BALI","NUSA TENGGARA TIMUR","PAPUA"]
+    np.random.seed(42)
+    data = {"Provinsi": provs, "Cluster": np.random.choice([0,1,-1], len(provs))}
+    for c in VAR_MAPPING.values(): data[c] = np.random.uniform(10,100, len(provs))
+    return prepare_dataset(pd.DataFrame(data), "dummy")
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def sidecar_paths(source, cache_dir=CACHE_DIR):
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(cache_dir, f"{stem}.feather"), os.path.join(cache_dir, f"{stem}.meta.json")
+
+
+def _atomic_write(path, write):
+    """Tulis ke file sementara lalu os.replace agar pembaca tidak melihat file setengah jadi"""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp): os.remove(tmp)
+        raise
+
+
+def convert(source=DATASET_FILE, cache_dir=CACHE_DIR):
+    """Parse xlsx -> validasi -> tulis sidecar Feather + metadata. Return DataFrame.
+
+    Penulisan sidecar hanya optimasi: jika cache_dir tidak bisa ditulis, dataset
+    yang sudah valid tetap dikembalikan (dan xlsx di-parse lagi lain kali).
+    """
+    df = prepare_dataset(pd.read_excel(source), source)
+    try:
+        write_sidecar(df, source, cache_dir)
+    except OSError as e:
+        print(f"Sidecar dataset tidak bisa ditulis ke {cache_dir}: {e}")
+    return df
+
+
+def write_sidecar(df, source=DATASET_FILE, cache_dir=CACHE_DIR):
+    """Tulis sidecar Feather + metadata untuk df hasil parse ``source``"""
+    os.makedirs(cache_dir, exist_ok=True)
+    data_path, meta_path = sidecar_paths(source, cache_dir)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    _atomic_write(data_path, lambda p: feather.write_feather(table, p, compression="uncompressed"))
+
+    stat = os.stat(source)
+    meta = {"schema_version": SCHEMA_VERSION, "source": os.path.basename(source),
+            "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": file_sha256(source)}
+    _atomic_write(meta_path, lambda p: _write_json(p, meta))
+
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def sidecar_is_fresh(source, cache_dir=CACHE_DIR):
+    """True jika sidecar cocok dengan xlsx (mtime+ukuran, atau hash jika mtime berubah)"""
+    data_path, meta_path = sidecar_paths(source, cache_dir)
+    meta = _read_json(meta_path)
+    if meta is None or meta.get("schema_version") != SCHEMA_VERSION or not os.path.exists(data_path):
+        return False
+
+    stat = os.stat(source)
+    if meta.get("mtime_ns") == stat.st_mtime_ns and meta.get("size") == stat.st_size:
+        return True
+    # mtime berubah (checkout/copy ulang) tapi isi sama: cukup perbarui metadata
+    if meta.get("size") == stat.st_size and meta.get("sha256") == file_sha256(source):
+        meta["mtime_ns"] = stat.st_mtime_ns
+        try:
+            _atomic_write(meta_path, lambda p: _write_json(p, meta))
+        except OSError:
+            pass  # cache read-only: hash dicek lagi lain kali
+        return True
+    return False
+
+
+def load_dataset(source=DATASET_FILE, cache_dir=CACHE_DIR):
+    """Baca dataset via sidecar (memory-mapped); bangun ulang jika xlsx berubah"""
+    if not os.path.exists(source):
+        raise FileNotFoundError(source)
+    if sidecar_is_fresh(source, cache_dir):
+        data_path, _ = sidecar_paths(source, cache_dir)
+        try:
+            return feather.read_table(data_path, memory_map=True).to_pandas()
+        except (OSError, pa.ArrowInvalid) as e:
+            # Sidecar rusak bukan berarti xlsx rusak: parse ulang dari sumber
+            print(f"Sidecar dataset tidak terbaca, parse ulang {source}: {e}")
+    return convert(source, cache_dir)
+
+
+def dataset_fingerprint(source=DATASET_FILE):
+    """Key isi dataset untuk cache bersama: hash xlsx + versi skema"""
+    if not os.path.exists(source):
+        return f"missing:{SCHEMA_VERSION}"
+    return f"{file_sha256(source)}:{SCHEMA_VERSION}"
+
+
+def load_or_dummy(source=DATASET_FILE, cache_dir=CACHE_DIR):
+    """load_dataset dengan fallback data contoh. Return (df, pesan_error).
+
+    Hanya file sumber yang tidak ada yang dianggap "belum ada data" (tanpa pesan);
+    error cache sidecar tidak sampai ke sini (lihat convert).
+    """
+    if not os.path.exists(source):
+        return dummy_dataset(), None
+    try:
+        return load_dataset(source, cache_dir), None
+    except DatasetSchemaError as e:
+        print(f"Error Dataset: {e}")
+        return dummy_dataset(), "; ".join(e.problems)
+    except (ValueError, zipfile.BadZipFile, OSError) as e:
+        # Workbook rusak / bukan xlsx / tidak terbaca: tetap tampilkan data contoh
+        print(f"Error Dataset: {e}")
+        return dummy_dataset(), f"file tidak bisa dibaca ({type(e).__name__}: {e})"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Konversi dataset Excel ke sidecar Feather")
+    parser.add_argument("command", choices=["convert"])
+    parser.add_argument("source", nargs="?", default=DATASET_FILE)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    try:
+        df = prepare_dataset(pd.read_excel(args.source), args.source)
+    except DatasetSchemaError as e:
+        parser.exit(1, "Dataset tidak valid:\n" + "".join(f"  - {p}\n" for p in e.problems))
+    except (ValueError, zipfile.BadZipFile, OSError) as e:
+        parser.exit(1, f"Dataset tidak bisa dibaca: {e}\n")
+    # Perintah convert memang untuk menulis sidecar: gagal tulis = gagal
+    try:
+        write_sidecar(df, args.source, args.cache_dir)
+    except OSError as e:
+        parser.exit(1, f"Sidecar tidak bisa ditulis: {e}\n")
+    print(f"{len(df)} baris -> {sidecar_paths(args.source, args.cache_dir)[0]}")
+    print(df.dtypes.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Ekspor statis dashboard (tanpa runtime Streamlit) ke folder HTML.
+
+Memakai pipeline yang sama dengan app.py (dataset + geometri, rekonsiliasi
+nama, merge, layer peta, grafik) lalu merender setiap kombinasi mode peta x
+indikator x background, box plot per indikator, profil per dimensi dan tabel
+interpretasi simbolik ke HTML. Render dibagi ke process pool. Setiap artefak
+punya key hash isi input di ``manifest.json``; ekspor berikutnya hanya
+merender artefak yang key-nya berubah.
+
+Pemakaian:
+    python -m geoai.export                    # ke folder site/
+    python -m geoai.export --out public --workers 4
+    python -m geoai.export --force            # render ulang semua
+"""
+import argparse
+import hashlib
+import html
+import json
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from geoai import datastore, pipeline
+from geoai.analysis import generate_emoji_analysis
+from geoai.cache import LRUCache, frame_version
+from geoai.charts import distribution_figure, profile_figure
+from geoai.geostore import GeometryStoreMissing
+from geoai.maps import MODE_KLASTER, MODE_VARIABEL, TILE_PROVIDERS, build_map, prepare_layers
+from geoai.metadata import CLEAN_VARS_LIST, DIMENSI_DICT
+from geoai.stats import cluster_cube
+
+OUT_DIR = os.path.join(datastore.ROOT_DIR, "site")
+MANIFEST_FILE = "manifest.json"
+
+# Naikkan jika cara render berubah agar semua artefak dirender ulang
+EXPORT_VERSION = 2
+
+
+def slugify(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def load_inputs(level=None):
+    """Dataset + geometri ter-merge lewat langkah yang sama dengan app.py (geoai/pipeline.py).
+
+    Tahun terakhir untuk data panel. Render cache di sini LRU biasa: hanya
+    dipakai sekali per ekspor, tidak dibagi dengan proses lain.
+    """
+    cache = LRUCache()
+    df_panel, error = pipeline.dataset(cache)
+    years = datastore.panel_years(df_panel)
+    df = datastore.year_snapshot(df_panel)
+    gdf, geo_version = pipeline.geometry(cache, level or pipeline.geo_level())
+    df, df_panel, gdf_final, _, _ = pipeline.merge(cache, df, df_panel, years, gdf, geo_version)
+    return {"df": df, "panel": df_panel if years else None, "gdf_final": gdf_final,
+            "geo_version": geo_version, "error": error}
+
+
+def _key(*parts):
+    return hashlib.sha1(json.dumps([EXPORT_VERSION, *parts], default=str).encode()).hexdigest()[:16]
+
+
+def plan(inputs):
+    """Daftar artefak: dict(path relatif, jenis, parameter, key isi input)"""
+    df = inputs["df"]
+    features = [c for c in CLEAN_VARS_LIST if c in df.columns]
+    artifacts = []
+
+    if inputs["gdf_final"] is not None:
+        data_version = frame_version(df)
+        if inputs["panel"] is not None:
+            data_version += frame_version(inputs["panel"])
+        for tile in TILE_PROVIDERS:
+            for mode, var in [(MODE_KLASTER, None)] + [(MODE_VARIABEL, v) for v in features]:
+                name = "klaster" if var is None else f"variabel-{slugify(var)}"
+                artifacts.append({
+                    "path": f"peta/{name}-{slugify(tile)}.html", "kind": "map",
+                    "params": {"mode": mode, "var": var, "tile": tile},
+                    "key": _key(data_version, inputs["geo_version"], mode, var, tile),
+                })
+
+    for var in features:
+        artifacts.append({
+            "path": f"grafik/distribusi-{slugify(var)}.html", "kind": "box", "params": {"var": var},
+            "key": _key(frame_version(df[['Provinsi', 'Cluster_Label', var]]), var),
+        })
+    for dim, vars_ in DIMENSI_DICT.items():
+        cols = ['Provinsi', 'Cluster', 'Cluster_Label'] + [v for v in vars_ if v in df.columns]
+        artifacts.append({
+            "path": f"grafik/profil-{slugify(dim)}.html", "kind": "profile", "params": {"dim": dim},
+            "key": _key(frame_version(df[cols]), dim),
+        })
+    artifacts.append({"path": "interpretasi.html", "kind": "emoji", "params": {}, "key": _key(frame_version(df))})
+    return artifacts
+
+
+# Input dikirim sekali per worker (initializer), bukan per artefak
+_worker = {}
+
+
+def _init_worker(inputs):
+    _worker["inputs"] = inputs
+    _worker["layers"] = {}
+    _worker["cube"] = None
+
+
+def _replace_into(path, write):
+    tmp = path + ".tmp"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _page(title, body):
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+            "<style>body{font-family:sans-serif;margin:2rem;color:#2c3e50}"
+            "table{border-collapse:collapse}td,th{border:1px solid #ddd;padding:4px 8px}</style>"
+            f"</head><body><h1>{html.escape(title)}</h1>{body}</body></html>")
+
+
+def render_artifact(artifact, out_dir):
+    """Render satu artefak ke out_dir (dijalankan di worker). Return (path, detik)."""
+    t0 = time.perf_counter()
+    inputs, params = _worker["inputs"], artifact["params"]
+    df = inputs["df"]
+    path = os.path.join(out_dir, artifact["path"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    if artifact["kind"] == "map":
+        layer_key = (params["mode"], params["var"])
+        if layer_key not in _worker["layers"]:
+            _worker["layers"][layer_key] = prepare_layers(
+                inputs["gdf_final"], df, params["mode"], params["var"], panel=inputs["panel"])
+        m = build_map(_worker["layers"][layer_key], params["mode"], params["var"], params["tile"])
+        _replace_into(path, m.save)
+    elif artifact["kind"] in ("box", "profile"):
+        if _worker["cube"] is None:
+            _worker["cube"] = cluster_cube(df)
+        cube = _worker["cube"]
+        fig = (distribution_figure(df, params["var"], cube) if artifact["kind"] == "box"
+               else profile_figure(df, params["dim"], cube=cube))
+        # plotly.min.js ditulis sekali di folder yang sama, bukan disisipkan ke tiap file
+        if fig is not None:
+            _replace_into(path, lambda p: fig.write_html(p, include_plotlyjs="directory"))
+    else:
+        table = generate_emoji_analysis(df).to_html(index=False, border=0)
+        _replace_into(path, lambda p: _write_text(p, _page("Interpretasi Kualitatif (Z-Score)", table)))
+    return artifact["path"], time.perf_counter() - t0
+
+
+def _write_text(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _read_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f).get("artifacts", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def write_index(artifacts, out_dir):
+    groups = {"map": "Peta", "box": "Distribusi", "profile": "Profil Rata-rata", "emoji": "Interpretasi Simbolik"}
+    body = []
+    for kind, title in groups.items():
+        links = "".join(f"<li><a href='{a['path']}'>{html.escape(a['path'].rsplit('/', 1)[-1][:-5])}</a></li>"
+                        for a in artifacts if a["kind"] == kind)
+        if links:
+            body.append(f"<h2>{title}</h2><ul>{links}</ul>")
+    _write_text(os.path.join(out_dir, "index.html"), _page("GeoAI Ketahanan Pangan", "".join(body)))
+
+
+def export(out_dir=OUT_DIR, workers=None, force=False, level=None):
+    """Render artefak yang berubah, hapus yang sudah tidak ada. Return ringkasan."""
+    t0 = time.perf_counter()
+    inputs = load_inputs(level)
+    artifacts = plan(inputs)
+    previous = {} if force else _read_manifest(out_dir)
+
+    todo = [a for a in artifacts
+            if previous.get(a["path"]) != a["key"] or not os.path.exists(os.path.join(out_dir, a["path"]))]
+    os.makedirs(out_dir, exist_ok=True)
+
+    timings = {}
+    if todo:
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker, initargs=(inputs,)) as pool:
+            for path, seconds in pool.map(render_artifact, todo, [out_dir] * len(todo)):
+                timings[path] = seconds
+
+    current = {a["path"] for a in artifacts}
+    removed = [p for p in previous if p not in current]
+    for p in removed:
+        if os.path.exists(os.path.join(out_dir, p)): os.remove(os.path.join(out_dir, p))
+
+    write_index(artifacts, out_dir)
+    manifest = {"version": EXPORT_VERSION, "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "artifacts": {a["path"]: a["key"] for a in artifacts}}
+    _replace_into(os.path.join(out_dir, MANIFEST_FILE),
+                  lambda p: _write_text(p, json.dumps(manifest, indent=2, ensure_ascii=False)))
+    return {"total": len(artifacts), "rendered": len(todo), "skipped": len(artifacts) - len(todo),
+            "removed": len(removed), "seconds": time.perf_counter() - t0, "timings": timings,
+            "error": inputs["error"]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ekspor statis dashboard ke HTML")
+    parser.add_argument("--out", default=OUT_DIR)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="render ulang semua artefak")
+    parser.add_argument("--level", default=None, help="level geometri (default sesuai zoom peta)")
+    args = parser.parse_args(argv)
+
+    try:
+        summary = export(args.out, args.workers, args.force, args.level)
+    except GeometryStoreMissing as e:
+        parser.exit(1, f"{e}\n")
+    if summary["error"]:
+        print(f"Dataset tidak valid, memakai data contoh: {summary['error']}")
+    print(f"{summary['rendered']} dirender, {summary['skipped']} tidak berubah, {summary['removed']} dihapus "
+          f"({summary['total']} artefak, {summary['seconds']:.1f} s) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Penyimpanan geometri provinsi lokal (GeoParquet) dengan beberapa level simplifikasi.
+
+Batas provinsi diambil sekali dari GEOJSON_URL, dinormalisasi (kolom
+``Provinsi`` dan ``Provinsi_Key`` sudah jadi), lalu disimpan per level
+simplifikasi di ``data/geo``. Aplikasi cukup membaca level yang sesuai zoom
+peta tanpa akses jaringan.
+
+``build`` adalah langkah deploy (``data/geo`` tidak ikut di-commit). Saat
+runtime tidak ada fallback ke URL: store yang belum dibangun menjadi
+GeometryStoreMissing, dan ``check`` keluar dengan kode 1 agar skrip deploy
+berhenti sebelum server dijalankan.
+
+Pemakaian:
+    python -m geoai.geostore build            # vendoring dari URL
+    python -m geoai.geostore build --source file.geojson
+    python -m geoai.geostore check            # gagal jika store belum lengkap
+    python -m geoai.geostore bench            # cold start & ukuran payload
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import geopandas as gpd
+import shapely
+
+from geoai.names import resolve_names
+
+GEOJSON_URL = "https://raw.githubusercontent.com/ans-4175/peta-indonesia-geojson/master/indonesia-prov.geojson"
+STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "geo")
+MANIFEST_FILE = "manifest.json"
+
+# Level simplifikasi -> toleransi (derajat). 0 berarti resolusi penuh.
+LEVELS = {"high": 0.0, "medium": 0.005, "low": 0.02}
+
+# Zoom Leaflet minimum untuk tiap level (dicek berurutan)
+ZOOM_LEVELS = [(9, "high"), (7, "medium"), (0, "low")]
+
+# Kolom yang mungkin berisi nama provinsi
+NAME_COLUMNS = ['propinsi', 'PROVINSI', 'NAME_1', 'province', 'name', 'NAME']
+
+
+class GeometryStoreMissing(FileNotFoundError):
+    """Store geometri lokal belum dibangun (langkah deploy terlewat)"""
+
+    def __init__(self, path):
+        super().__init__(f"Store geometri belum dibangun ({path}). "
+                         f"Jalankan `python -m geoai.geostore build` saat deploy.")
+        self.path = path
+
+
+def level_for_zoom(zoom):
+    """Pilih level simplifikasi yang cukup detail untuk zoom peta"""
+    for min_zoom, level in ZOOM_LEVELS:
+        if zoom >= min_zoom: return level
+    return ZOOM_LEVELS[-1][1]
+
+
+def store_path(level, store_dir=STORE_DIR):
+    return os.path.join(store_dir, f"provinsi_{level}.parquet")
+
+
+def prepare_geometry(gdf):
+    """Deteksi kolom nama provinsi & buat Provinsi_Key. None jika tidak ada kolom nama."""
+    target_col = next((c for c in NAME_COLUMNS if c in gdf.columns), None)
+    if target_col is None:
+        # Fallback jika tidak ketemu, pakai kolom pertama yang tipe string
+        obj_cols = gdf.select_dtypes(include=['object', 'string']).columns
+        target_col = obj_cols[0] if len(obj_cols) > 0 else None
+    if target_col is None:
+        return None
+
+    gdf = gdf.rename(columns={target_col: 'Provinsi'})
+    gdf['Provinsi_Key'] = resolve_names(gdf['Provinsi'])
+    return gdf[['Provinsi', 'Provinsi_Key', 'geometry']]
+
+
+def simplify_geometry(geoms, tolerance):
+    """Simplifikasi yang menjaga topologi (batas antar provinsi tetap berimpit)"""
+    if tolerance <= 0:
+        return geoms
+    try:
+        # Simplifikasi coverage: tepi bersama disederhanakan sekali untuk kedua sisi
+        return gpd.GeoSeries(shapely.coverage_simplify(geoms.values, tolerance), index=geoms.index, crs=geoms.crs)
+    except (AttributeError, shapely.errors.GEOSException):
+        # GEOS lama / geometri bukan coverage valid: simplifikasi per poligon
+        return geoms.simplify(tolerance, preserve_topology=True)
+
+
+def build_store(source=GEOJSON_URL, store_dir=STORE_DIR):
+    """Baca sumber GeoJSON sekali lalu tulis semua level ke GeoParquet"""
+    gdf = prepare_geometry(gpd.read_file(source))
+    if gdf is None:
+        raise ValueError(f"Kolom nama provinsi tidak ditemukan di {source}")
+    gdf = gdf.to_crs(epsg=4326) if gdf.crs is not None else gdf.set_crs(epsg=4326)
+    gdf['geometry'] = gdf.geometry.make_valid()
+
+    os.makedirs(store_dir, exist_ok=True)
+    manifest = {"source": source, "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "levels": {}}
+    for level, tolerance in LEVELS.items():
+        out = gdf.copy()
+        out['geometry'] = simplify_geometry(gdf.geometry, tolerance)
+        path = store_path(level, store_dir)
+        out.to_parquet(path, index=False)
+        manifest["levels"][level] = {
+            "tolerance": tolerance,
+            "features": len(out),
+            "vertices": int(shapely.get_num_coordinates(out.geometry.values).sum()),
+            "parquet_bytes": os.path.getsize(path),
+            "geojson_bytes": len(out.to_json().encode("utf-8")),
+        }
+
+    with open(os.path.join(store_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_geometry(level="low", store_dir=STORE_DIR):
+    """Baca satu level dari store lokal. None jika store belum dibangun."""
+    path = store_path(level, store_dir)
+    if not os.path.exists(path):
+        return None
+    return gpd.read_parquet(path)
+
+
+def geometry_fingerprint(level="low", store_dir=STORE_DIR):
+    """Key isi geometri untuk cache bersama: hash file store (``missing:`` jika belum dibangun)"""
+    path = store_path(level, store_dir)
+    if not os.path.exists(path):
+        return f"missing:{path}"
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def require_geometry(level="low", store_dir=STORE_DIR):
+    """Baca satu level dari store lokal; GeometryStoreMissing jika belum dibangun"""
+    gdf = load_geometry(level, store_dir)
+    if gdf is None:
+        raise GeometryStoreMissing(store_path(level, store_dir))
+    return gdf
+
+
+def missing_levels(store_dir=STORE_DIR):
+    return [level for level in LEVELS if not os.path.exists(store_path(level, store_dir))]
+
+
+def benchmark(source=GEOJSON_URL, store_dir=STORE_DIR):
+    """Bandingkan cold start & payload: fetch URL (cara lama) vs store lokal"""
+    rows = []
+    t0 = time.perf_counter()
+    gdf = prepare_geometry(gpd.read_file(source))
+    rows.append({"source": "url", "seconds": time.perf_counter() - t0,
+                 "geojson_bytes": len(gdf.to_json().encode("utf-8"))})
+    for level in LEVELS:
+        t0 = time.perf_counter()
+        gdf = load_geometry(level, store_dir)
+        if gdf is None:
+            continue
+        rows.append({"source": f"store:{level}", "seconds": time.perf_counter() - t0,
+                     "geojson_bytes": len(gdf.to_json().encode("utf-8"))})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Store geometri provinsi lokal")
+    parser.add_argument("command", choices=["build", "check", "bench"])
+    parser.add_argument("--source", default=GEOJSON_URL, help="URL/path GeoJSON sumber")
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        manifest = build_store(args.source, args.store_dir)
+        for level, info in manifest["levels"].items():
+            print(f"{level:<7} tol={info['tolerance']:<6} vertices={info['vertices']:>8,} "
+                  f"parquet={info['parquet_bytes']:>10,} B  geojson={info['geojson_bytes']:>10,} B")
+    elif args.command == "check":
+        missing = missing_levels(args.store_dir)
+        if missing:
+            parser.exit(1, f"Store geometri belum lengkap di {args.store_dir} (tidak ada: {', '.join(missing)}). "
+                           f"Jalankan `python -m geoai.geostore build`.\n")
+        print(f"Store geometri lengkap: {args.store_dir}")
+    else:
+        print(f"{'sumber':<14}{'detik':>10}{'payload GeoJSON (B)':>22}")
+        for row in benchmark(args.source, args.store_dir):
+            print(f"{row['source']:<14}{row['seconds']:>10.3f}{row['geojson_bytes']:>22,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+"""Pembuatan peta Folium (merge geometri, layer GeoJSON, legenda).
+
+folium, branca & shapely diimpor di dalam fungsi yang memakainya agar modul
+ini (konstanta peta, TILE_PROVIDERS) murah diimpor halaman yang tidak
+menampilkan peta.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+from geoai.datastore import YEAR_COLUMN, panel_years
+from geoai.metadata import VAR_MAPPING
+
+# Posisi awal peta (zoom juga menentukan level simplifikasi geometri)
+MAP_CENTER = [-2.5, 118.0]
+MAP_ZOOM = 5
+
+MODE_KLASTER = "🗺️ Hasil Klaster"
+MODE_VARIABEL = "📈 Sebaran Variabel"
+
+TILE_PROVIDERS = ["CartoDB positron", "CartoDB dark_matter", "OpenStreetMap"]
+
+# Mode payload ringkas: hanya properti yang dipakai layer & koordinat dibulatkan
+COMPACT_PAYLOAD = True
+COORD_PRECISION = 4  # desimal derajat (~11 m), jauh di bawah 1 piksel pada zoom 5
+
+CHOROPLETH_BINS = 6
+NAN_FILL_COLOR = 'black'
+
+# Jeda antar tahun saat tombol putar ditekan (ms)
+PLAYBACK_INTERVAL = 1200
+
+# Warna baru yang lebih cerah dan beda dari abu-abu
+CLUSTER_COLORS = {
+    'Klaster 0': '#575fcf', # Biru Tua
+    'Klaster 1': '#3498db', # Biru
+    'Klaster 2': '#2ecc71', # Hijau
+    'Klaster 3': '#f1c40f', # Kuning
+    'Klaster 4': '#9b59b6', # Ungu (Baru)
+    'Klaster 5': '#e67e22', # Oranye (Baru)
+    'Klaster 6': '#1abc9c', # Tosca (Baru)
+    'Noise (Outlier)': '#7f8c8d', # TETAP ABU-ABU (sesuai request)
+    'Tidak Ada Data': '#ffffff'   # PUTIH (biar beda jauh sama Outlier)
+}
+
+# Warna cadangan untuk klaster ke-7 dst. (hasil re-klaster bisa > 7 klaster)
+EXTRA_COLORS = ['#e84393', '#00cec9', '#6c5ce7', '#fdcb6e', '#d63031', '#0984e3', '#00b894', '#b2bec3']
+
+
+def cluster_colors(labels):
+    """Warna untuk semua label yang ada; label baru diberi warna dari EXTRA_COLORS"""
+    colors = dict(CLUSTER_COLORS)
+    extra = sorted((l for l in set(labels) if l not in colors), key=_label_order)
+    for i, label in enumerate(extra):
+        colors[label] = EXTRA_COLORS[i % len(EXTRA_COLORS)]
+    return colors
+
+
+def _label_order(label):
+    """Urutan label: Klaster 0, 1, ..., 10 (numerik), lalu label lain"""
+    tail = label.rsplit(" ", 1)[-1]
+    return (0, int(tail), label) if label.startswith("Klaster") and tail.lstrip("-").isdigit() else (1, 0, label)
+
+
+# Metrik panel detail provinsi: (label, kolom, format)
+DETAIL_METRICS = [
+    ("IKP (X1)", VAR_MAPPING['X1'], "{:.2f}"),
+    ("Prod. Padi", VAR_MAPPING['X2'], "{:,.0f}"),
+    ("Pendapatan", VAR_MAPPING['X4'], "{:,.0f}"),
+]
+
+
+def feature_key(key, year=None):
+    """Key panel detail: Provinsi_Key, atau (Provinsi_Key, tahun) untuk data panel"""
+    return key if year is None else (key, int(year))
+
+
+def build_detail_index(df):
+    """Provinsi_Key -> isi panel detail yang sudah diformat, agar klik peta cukup lookup dict"""
+    index = {}
+    for rec in df.to_dict('records'):
+        key = feature_key(rec['Provinsi_Key'], rec.get(YEAR_COLUMN))
+        if key in index: continue  # sama seperti .iloc[0]: baris pertama menang
+        index[key] = {
+            "Provinsi": rec['Provinsi'],
+            "Status": rec['Cluster_Label'],
+            "metrics": [(label, fmt.format(rec.get(col, 0))) for label, col, fmt in DETAIL_METRICS],
+        }
+    return index
+
+
+def clicked_key(st_data):
+    """Provinsi_Key dari hasil st_folium (None jika belum ada klik).
+
+    ``last_object_clicked`` hanya berisi latlng; ``last_active_drawing`` adalah
+    layer.toGeoJSON() fitur yang diklik, termasuk Tahun dari year player.
+    """
+    obj = (st_data or {}).get('last_active_drawing') or {}
+    props = obj.get('properties') or {}
+    key = props.get('Provinsi_Key')
+    return feature_key(key, props.get(YEAR_COLUMN)) if key is not None else None
+
+
+def merge_geodata(gdf, df):
+    """Gabungkan geometri dengan data klaster + nama tampilan (satu kolom nama, tanpa _x/_y)"""
+    geo = gdf.rename(columns={'Provinsi': 'Provinsi_Show'})
+    gdf_final = geo.merge(df.rename(columns={'Provinsi': 'Provinsi_Data'}), on="Provinsi_Key", how="left")
+    gdf_final['Cluster_Label'] = fill_labels(gdf_final['Cluster_Label'])
+
+    # Smart Display Name (Prioritas nama dari Excel kalau ada)
+    # Tanpa astype("str") sebelum fillna: di pandas 2 NaN menjadi teks "nan"
+    names = gdf_final['Provinsi_Data']
+    if 'Provinsi_Show' in gdf_final.columns:
+        names = names.fillna(gdf_final['Provinsi_Show'])
+    gdf_final['Provinsi_Show'] = names
+    return gdf_final.drop(columns='Provinsi_Data')
+
+
+def fill_labels(labels, missing="Tidak Ada Data"):
+    """Label klaster kosong (wilayah tanpa data) -> ``missing``; aman untuk categorical"""
+    if isinstance(labels.dtype, pd.CategoricalDtype) and missing not in labels.cat.categories:
+        labels = labels.cat.add_categories([missing])
+    return labels.fillna(missing)
+
+
+def build_legend_html(df, colors=CLUSTER_COLORS):
+    """Legenda klaster beserta daftar anggota provinsi"""
+    # Anggota per label cukup dihitung sekali (bukan filter df per warna)
+    members_by_label = df.groupby('Cluster_Label', sort=False)['Provinsi'].agg(list).to_dict()
+
+    # Urutkan label agar rapi (Klaster 0, 1, ... lalu Noise)
+    sorted_keys = sorted([k for k in colors.keys() if "Klaster" in k], key=_label_order) + ['Noise (Outlier)']
+
+    legend_items = []
+    for label in sorted_keys:
+        color = colors[label]
+        members = members_by_label.get(label, [])
+        members_str = ", ".join(members) if members else "-"
+
+        item_html = f"""
+        <div style="margin-bottom: 8px; border-bottom: 1px solid #ddd; padding-bottom: 5px;">
+            <div style="display: flex; align-items: center; font-weight: bold; font-size: 13px; color: #000000;">
+                <i style="background:{color}; width:12px; height:12px; display:inline-block; margin-right:8px; border:1px solid #333; flex-shrink: 0;"></i>
+                {label} <span style="font-weight:normal; font-size:10px; margin-left:5px; color: #333;">({len(members)} prov)</span>
+            </div>
+            <div style="font-size: 10px; color: #000000; margin-left: 20px; line-height: 1.2; margin-top: 2px;">
+                {members_str}
+            </div>
+        </div>
+        """
+        legend_items.append(item_html)
+
+    # --- TAMPILAN LEGEND (SCROLLABLE) ---
+    return f"""
+    <div id="geoai-legend" style="
+        position: fixed;
+        bottom: 30px; left: 30px;
+        z-index: 9999;
+        width: 250px;
+        max-height: 350px;
+        overflow-y: auto;
+        background: rgba(255, 255, 255, 0.95); /* Background Putih Solid */
+        padding: 15px;
+        border: 1px solid #ccc;
+        border-radius: 8px;
+        box-shadow: 2px 2px 10px rgba(0,0,0,0.2);
+        font-family: sans-serif;
+        color: #000000;"> <h5 style="margin-top:0; margin-bottom:10px; border-bottom:2px solid #333; padding-bottom:5px; color: #000000;">
+            🗺️ Legenda & Anggota
+        </h5>
+        {''.join(legend_items)}
+        <div style="font-size:9px; color: #333; margin-top:5px;">
+            <i>*Scroll untuk melihat daftar lengkap</i>
+        </div>
+    </div>
+    """
+
+
+def layer_fields(map_mode, var_select):
+    """Properti fitur yang benar-benar dipakai layer (tooltip, popup, style, klik)"""
+    if map_mode == MODE_KLASTER:
+        return ['Provinsi_Key', 'Provinsi_Show', 'Cluster_Label', VAR_MAPPING["X1"], YEAR_COLUMN]
+    return ['Provinsi_Key', 'Provinsi_Show', var_select, YEAR_COLUMN]
+
+
+def to_geojson(gdf, fields=None, precision=COORD_PRECISION):
+    """GeoJSON dict dengan properti terpilih & koordinat dibulatkan (None = apa adanya)"""
+    import shapely
+
+    if fields is not None:
+        gdf = gdf[[c for c in fields if c in gdf.columns] + ['geometry']]
+    if precision is not None:
+        gdf = gdf.set_geometry(shapely.transform(gdf.geometry.values, lambda c: np.round(c, precision)))
+    return json.loads(gdf.to_json())
+
+
+def payload_bytes(geojson):
+    """Ukuran GeoJSON yang dikirim ke browser"""
+    return len(json.dumps(geojson, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+
+def choropleth_colors(values, bins=CHOROPLETH_BINS, palette="YlOrRd"):
+    """Warna per nilai + colormap legenda, bin sama seperti folium.Choropleth"""
+    from branca.colormap import StepColormap
+    from branca.utilities import color_brewer
+
+    values = np.asarray(values, dtype=np.float64)
+    real = values[~np.isnan(values)]
+    _, edges = np.histogram(real, bins=bins)
+    colors = np.array(color_brewer(palette, n=bins))
+    scale = StepColormap(list(colors), index=list(edges), vmin=edges.min(), vmax=edges.max())
+
+    # Tepi kanan dibuat inklusif untuk np.digitize (sama seperti Choropleth)
+    edges = edges.astype(float)
+    edges[-1] = np.nextafter(edges[-1], np.inf)
+    idx = np.clip(np.digitize(values, edges) - 1, 0, bins - 1)
+    return np.where(np.isnan(values), NAN_FILL_COLOR, colors[idx]), scale
+
+
+def _json_values(values):
+    """List siap JSON: NaN -> null, numpy scalar -> Python"""
+    return [None if pd.isna(v) else (v.item() if hasattr(v, "item") else v) for v in values]
+
+
+def year_frames(gdf_final, panel, map_mode, var_select, colors):
+    """Update style + properti per tahun, urut sesuai fitur GeoJSON (tanpa geometri).
+
+    Return (frames, colormap). Choropleth memakai satu skala bin untuk semua
+    tahun agar warna antar tahun bisa dibandingkan.
+    """
+    keys = gdf_final['Provinsi_Key']
+    years = panel_years(panel)
+    rows = {y: (panel[panel[YEAR_COLUMN] == y].drop_duplicates('Provinsi_Key')
+                .set_index('Provinsi_Key').reindex(keys)) for y in years}
+
+    frames, colormap = {}, None
+    if map_mode == MODE_KLASTER:
+        fields = ['Cluster_Label', VAR_MAPPING["X1"]]
+        for y in years:
+            labels = fill_labels(rows[y]['Cluster_Label'])
+            frames[str(y)] = {
+                "fill": [colors.get(l, 'grey') for l in labels],
+                "props": {"Cluster_Label": labels.tolist(),
+                          VAR_MAPPING["X1"]: _json_values(rows[y][VAR_MAPPING["X1"]])},
+                "legend": build_legend_html(panel[panel[YEAR_COLUMN] == y], colors),
+            }
+    else:
+        fields = [var_select]
+        values = np.concatenate([rows[y][var_select].to_numpy(dtype=np.float64) for y in years])
+        fills, colormap = choropleth_colors(values)
+        colormap.caption = var_select
+        for i, y in enumerate(years):
+            part = slice(i * len(keys), (i + 1) * len(keys))
+            frames[str(y)] = {"fill": fills[part].tolist(), "props": {var_select: _json_values(values[part])}}
+    return {"years": years, "keys": keys.tolist(), "fields": fields, "frames": frames}, colormap
+
+
+def prepare_layers(gdf_final, df, map_mode, var_select=None, compact=COMPACT_PAYLOAD, panel=None):
+    """Bagian mahal peta (GeoJSON fitur, warna, legenda), dihitung sekali per key cache.
+
+    ``panel`` (dataset multi-tahun) menambah ``year_frames``: geometri tetap
+    dikirim sekali, pergantian tahun hanya mengganti warna & properti di browser.
+    """
+    if panel is not None and len(panel_years(panel)) < 2:
+        panel = None
+    labels = df['Cluster_Label'] if panel is None else panel['Cluster_Label']
+    colors = cluster_colors(labels.unique())
+    layers = {"geojson": None, "fills": None, "colormap": None, "legend_html": None,
+              "colors": colors, "payload_bytes": 0, "years": None, "frames_bytes": 0}
+    if gdf_final is None:
+        return layers
+
+    if compact:
+        layers["geojson"] = to_geojson(gdf_final, layer_fields(map_mode, var_select))
+    else:
+        layers["geojson"] = to_geojson(gdf_final, precision=None)
+    layers["payload_bytes"] = payload_bytes(layers["geojson"])
+
+    if map_mode == MODE_KLASTER:
+        layers["legend_html"] = build_legend_html(df, colors)
+    else:
+        # Warna choropleth dihitung di server: cukup satu layer untuk isi + tooltip
+        fills, colormap = choropleth_colors(gdf_final[var_select].to_numpy(dtype=np.float64))
+        colormap.caption = var_select
+        layers["fills"] = dict(zip(gdf_final['Provinsi_Key'], fills))
+        layers["colormap"] = colormap
+
+    if panel is not None:
+        frames, colormap = year_frames(gdf_final, panel, map_mode, var_select, colors)
+        layers["years"] = frames
+        layers["frames_bytes"] = payload_bytes(frames)
+        if colormap is not None:
+            # Warna awal (tahun terakhir) ikut skala gabungan semua tahun
+            last = frames["frames"][str(frames["years"][-1])]["fill"]
+            layers["fills"] = dict(zip(frames["keys"], last))
+            layers["colormap"] = colormap
+    return layers
+
+
+# Slider + tombol putar tahun (Leaflet control); mengganti style/properti fitur
+# di browser. Waktu transisi terakhir (restyle semua fitur) tampil di kontrol.
+YEAR_PLAYER_TEMPLATE = """
+    {% macro script(this, kwargs) %}
+    (function() {
+        var layer = {{ this.layer.get_name() }};
+        var data = {{ this.frames|tojson }};
+        var index = {};
+        data.keys.forEach(function(k, i) { index[k] = i; });
+
+        var control = L.control({position: 'topright'});
+        var slider, label, timing, button, timer = null;
+
+        function show(pos) {
+            var t0 = performance.now();
+            var year = data.years[pos], frame = data.frames[String(year)];
+            layer.eachLayer(function(l) {
+                var j = index[l.feature.properties.Provinsi_Key];
+                if (j === undefined) return;
+                data.fields.forEach(function(f) { l.feature.properties[f] = frame.props[f][j]; });
+                l.feature.properties.{{ this.year_column }} = year;
+                l.setStyle({fillColor: frame.fill[j]});
+            });
+            if (frame.legend) {
+                var legend = document.getElementById('geoai-legend');
+                if (legend) legend.outerHTML = frame.legend;
+            }
+            slider.value = pos;
+            label.innerHTML = year;
+            timing.innerHTML = (performance.now() - t0).toFixed(1) + ' ms';
+        }
+
+        control.onAdd = function() {
+            var div = L.DomUtil.create('div', 'leaflet-bar');
+            div.style.cssText = 'background:#fff;padding:6px 8px;font:12px sans-serif;';
+            div.innerHTML = '<button type="button">&#9654;</button> '
+                + '<input type="range" min="0" max="' + (data.years.length - 1) + '" step="1" style="vertical-align:middle;width:120px;"> '
+                + '<b></b> <span style="color:#888;"></span>';
+            button = div.querySelector('button');
+            slider = div.querySelector('input');
+            label = div.querySelector('b');
+            timing = div.querySelector('span');
+            L.DomEvent.disableClickPropagation(div);
+            L.DomEvent.disableScrollPropagation(div);
+            slider.addEventListener('input', function() { show(parseInt(slider.value, 10)); });
+            button.addEventListener('click', function() {
+                if (timer) {
+                    clearInterval(timer); timer = null; button.innerHTML = '&#9654;';
+                    return;
+                }
+                button.innerHTML = '&#10074;&#10074;';
+                timer = setInterval(function() {
+                    show((parseInt(slider.value, 10) + 1) % data.years.length);
+                }, {{ this.interval }});
+            });
+            return div;
+        };
+        control.addTo({{ this._parent.get_name() }});
+        show(data.years.length - 1);
+    })();
+    {% endmacro %}
+"""
+
+
+def year_player(layer, frames, interval=PLAYBACK_INTERVAL):
+    """Elemen folium untuk YEAR_PLAYER_TEMPLATE yang menempel ke layer GeoJSON"""
+    from branca.element import MacroElement
+    from jinja2 import Template
+
+    element = MacroElement()
+    element._name = "YearPlayer"
+    element._template = Template(YEAR_PLAYER_TEMPLATE)
+    element.layer = layer
+    element.frames = frames
+    element.interval = int(interval)
+    element.year_column = YEAR_COLUMN
+    return element
+
+
+def build_map(layers, map_mode, var_select, tile_provider):
+    """Rakit folium.Map baru dari layer yang sudah disiapkan (murah, aman dipanggil tiap rerun)"""
+    import folium
+
+    m = folium.Map(location=MAP_CENTER, zoom_start=MAP_ZOOM, tiles=tile_provider)
+    colors = layers["colors"]
+    geojson = layers["geojson"]
+    if geojson is None:
+        return m
+
+    if map_mode == MODE_KLASTER:
+        layer = folium.GeoJson(
+            geojson,
+            style_function=lambda x: {
+                'fillColor': colors.get(x['properties'].get('Cluster_Label'), 'grey'),
+                'color': 'black',
+                'weight': 1,
+                'fillOpacity': 0.7
+            },
+            tooltip=folium.GeoJsonTooltip(
+                fields=['Provinsi_Show', 'Cluster_Label', VAR_MAPPING["X1"]],
+                aliases=['Prov:', 'Status:', 'IKP:']
+            ),
+            popup=folium.GeoJsonPopup(fields=['Provinsi_Show', 'Cluster_Label'])
+        ).add_to(m)
+        m.get_root().html.add_child(folium.Element(layers["legend_html"]))
+    else:
+        fills = layers["fills"]
+        layer = folium.GeoJson(
+            geojson,
+            style_function=lambda x: {
+                'fillColor': fills.get(x['properties'].get('Provinsi_Key'), NAN_FILL_COLOR),
+                'color': 'black',
+                'weight': 1,
+                'fillOpacity': 0.6
+            },
+            tooltip=folium.GeoJsonTooltip(fields=['Provinsi_Show', var_select])
+        ).add_to(m)
+        layers["colormap"].add_to(m)
+
+    if layers.get("years"):
+        year_player(layer, layers["years"]).add_to(m)
+    return m
@@ -0,0 +1,98 @@
+"""Konfigurasi variabel penelitian & metadata (lengkap sesuai skripsi)."""
+
+VAR_MAPPING = {
+    "X1": "Indeks Ketahanan Pangan (IKP)",
+    "X2": "Produksi Padi",
+    "X3": "Produksi Jagung",
+    "X4": "Pendapatan per Kapita",
+    "X5": "Persentase Pengeluaran per Kapita Sebulan Makanan",
+    "X6": "Realisasi Penerima Bansos Pangan",
+    "X7": "Harga Komoditas Beras",
+    "X8": "Harga Komoditas Jagung",
+    "X9": "Akses Air Minum Layak",
+    "X10": "Akses Sanitasi Layak",
+    "X11": "Prevalensi Balita Wasting",
+    "X12": "Prevalensi Balita Underweight",
+    "X13": "Kepadatan Penduduk",
+    "X14": "Indeks Risiko Bencana"
+}
+
+# Metadata Detail (Sumber: Bab 3 Skripsi)
+VAR_METADATA = {
+    "X1": {
+        "Unit": "Skor (0-100)", 
+        "Def": "Indikator komposit yang digunakan untuk mengukur kondisi ketahanan pangan suatu wilayah berdasarkan dimensi ketersediaan, akses, dan pemanfaatan pangan (BPN, 2023)."
+    },
+    "X2": {
+        "Unit": "Ton", 
+        "Def": "Jumlah total padi yang dipanen, diukur dalam ton gabah kering panen. Dihitung dari luas panen dikali hasil per hektar (BPS, 2024)."
+    },
+    "X3": {
+        "Unit": "Ton", 
+        "Def": "Jumlah total jagung yang dipanen dalam satu musim tanam. Mencerminkan output fisik kinerja pertanian jagung (BPS, 2024)."
+    },
+    "X4": {
+        "Unit": "Rupiah", 
+        "Def": "Pendapatan rata-rata setiap individu dalam suatu wilayah. Mencerminkan kemampuan ekonomi/daya beli masyarakat terhadap pangan (Eliezer, 2024)."
+    },
+    "X5": {
+        "Unit": "Persen (%)", 
+        "Def": "Persentase rata-rata pengeluaran individu per bulan untuk makanan. Semakin tinggi persentasenya, semakin besar beban ekonomi rumah tangga (BPN, 2023)."
+    },
+    "X6": {
+        "Unit": "Keluarga (KPM)", 
+        "Def": "Jumlah bantuan sosial yang telah disalurkan dan diterima oleh masyarakat untuk menjaga akses pangan saat terjadi guncangan ekonomi (Dalias & Wisana, 2023)."
+    },
+    "X7": {
+        "Unit": "Rupiah/Kg", 
+        "Def": "Harga rata-rata beras kualitas medium di tingkat konsumen. Kestabilan harga beras krusial untuk kepastian akses pangan (Widarso & Djamaluddin, 2024)."
+    },
+    "X8": {
+        "Unit": "Rupiah/Kg", 
+        "Def": "Nilai jual jagung di pasar pada periode tertentu. Dipengaruhi oleh kualitas, lokasi, dan kondisi pasar (BPS, 2024)."
+    },
+    "X9": {
+        "Unit": "Persen (%)", 
+        "Def": "Persentase penduduk yang menggunakan sumber air minum yang memenuhi syarat teknis dan kesehatan (FAO)."
+    },
+    "X10": {
+        "Unit": "Persen (%)", 
+        "Def": "Persentase penduduk yang memiliki akses terhadap fasilitas sanitasi yang aman, layak, dan tidak mencemari lingkungan (FAO, 2024)."
+    },
+    "X11": {
+        "Unit": "Persen (%)", 
+        "Def": "Proporsi balita dengan berat badan terlalu rendah dibandingkan tinggi badan (kurus). Menandakan masalah gizi akut jangka pendek (FAO, 2024)."
+    },
+    "X12": {
+        "Unit": "Persen (%)", 
+        "Def": "Persentase balita dengan berat badan kurang dari standar usianya (BB/U). Mencerminkan akumulasi masalah gizi kronis dan akut (WHO)."
+    },
+    "X13": {
+        "Unit": "Jiwa/km²", 
+        "Def": "Jumlah penduduk per satuan luas wilayah. Tekanan demografis dapat mengganggu stabilitas ketersediaan pangan (FAO)."
+    },
+    "X14": {
+        "Unit": "Skor Indeks", 
+        "Def": "Potensi terjadinya kehilangan nyawa atau kerusakan aset akibat bencana. Dinilai berdasarkan bahaya, kerentanan, dan kapasitas (UNDRR, 2017)."
+    }
+}
+
+CLEAN_VARS_LIST = list(VAR_MAPPING.values())
+
+INDIKATOR_NEGATIF = [
+    "Persentase Pengeluaran per Kapita Sebulan Makanan",
+    "Harga Komoditas Beras", 
+    "Harga Komoditas Jagung",
+    "Prevalensi Balita Wasting",
+    "Prevalensi Balita Underweight",
+    "Kepadatan Penduduk",
+    "Indeks Risiko Bencana"
+]
+
+DIMENSI_DICT = {
+    "Indikator Umum": ["Indeks Ketahanan Pangan (IKP)"],
+    "Ketersediaan (Availability)": ["Produksi Padi", "Produksi Jagung"],
+    "Aksesibilitas (Accessibility)": ["Pendapatan per Kapita", "Persentase Pengeluaran per Kapita Sebulan Makanan", "Realisasi Penerima Bansos Pangan", "Harga Komoditas Beras", "Harga Komoditas Jagung"],
+    "Pemanfaatan (Utilization)": ["Akses Air Minum Layak", "Akses Sanitasi Layak", "Prevalensi Balita Wasting", "Prevalensi Balita Underweight"],
+    "Stabilitas (Stability)": ["Kepadatan Penduduk", "Indeks Risiko Bencana"]
+}
@@ -0,0 +1,113 @@
+"""Resolusi nama wilayah agar Excel match dengan GeoJSON.
+
+Nama dibakukan (huruf besar, tanpa titik/spasi ganda, singkatan seperti
+KAB/KEP diperpanjang) lalu dicocokkan ke tabel alias yang sudah dikompilasi
+sekali saat import. Satu kolom diproses lewat satu ``map`` atas nilai unik.
+Nama yang tetap tidak dikenal dicocokkan fuzzy (di-cache) ke kosakata sisi
+lain merge, dan sisanya dilaporkan di ``match_report``.
+"""
+import difflib
+import functools
+import re
+
+import pandas as pd
+
+# Singkatan per kata -> bentuk panjang
+TOKEN_EXPANSIONS = {
+    "KAB": "KABUPATEN",
+    "KEP": "KEPULAUAN",
+    "PROV": "PROVINSI",
+}
+
+ALIASES = {
+    # --- PERBAIKAN NAMA PROVINSI (SESUAI REQUEST) ---
+    "DI. ACEH": "ACEH",
+    "NANGGROE ACEH DARUSSALAM": "ACEH",
+
+    "DI YOGYAKARTA": "DI YOGYAKARTA", "DIY": "DI YOGYAKARTA", "DAERAH ISTIMEWA YOGYAKARTA": "DI YOGYAKARTA",
+    "D.I. YOGYAKARTA": "DI YOGYAKARTA",
+    "DKI JAKARTA": "DKI JAKARTA", "JAKARTA": "DKI JAKARTA", "JAKARTA RAYA": "DKI JAKARTA",
+
+    # --- UPDATE FIX: Menambahkan variasi tanpa titik ---
+    "BANGKA BELITUNG": "KEPULAUAN BANGKA BELITUNG",
+    "KEP. BANGKA BELITUNG": "KEPULAUAN BANGKA BELITUNG",
+    "KEP BANGKA BELITUNG": "KEPULAUAN BANGKA BELITUNG", # Tambahan
+
+    "KEPULAUAN RIAU": "KEPULAUAN RIAU",
+    "KEP. RIAU": "KEPULAUAN RIAU",
+    "KEP RIAU": "KEPULAUAN RIAU", # Tambahan
+
+    "NUSATENGGARA BARAT": "NUSA TENGGARA BARAT",
+    "NUSA TENGGARA BARAT": "NUSA TENGGARA BARAT", "NTB": "NUSA TENGGARA BARAT",
+
+    "NUSATENGGARA TIMUR": "NUSA TENGGARA TIMUR",
+    "NUSA TENGGARA TIMUR": "NUSA TENGGARA TIMUR", "NTT": "NUSA TENGGARA TIMUR",
+
+    "PAPUA BARAT DAYA": "PAPUA BARAT DAYA", "PAPUA SELATAN": "PAPUA SELATAN",
+    "PAPUA TENGAH": "PAPUA TENGAH", "PAPUA PEGUNUNGAN": "PAPUA PEGUNUNGAN"
+}
+
+# Kemiripan minimum (difflib ratio) untuk pencocokan fuzzy
+FUZZY_CUTOFF = 0.88
+
+_TOKEN_RE = re.compile(r"\b(" + "|".join(TOKEN_EXPANSIONS) + r")\b")
+
+
+def canonical_form(name):
+    """Bentuk baku sebelum lookup alias: huruf besar, titik jadi spasi, singkatan diperpanjang"""
+    name = " ".join(name.upper().replace(".", " ").split())
+    return _TOKEN_RE.sub(lambda m: TOKEN_EXPANSIONS[m.group(1)], name)
+
+
+# Tabel alias dikompilasi sekali dengan bentuk baku yang sama
+_ALIAS_TABLE = {canonical_form(k): v for k, v in ALIASES.items()}
+
+
+def normalize_name(name):
+    """Normalisasi Nama Provinsi agar Excel match dengan GeoJSON"""
+    if not isinstance(name, str): return str(name)
+    key = canonical_form(name)
+    return _ALIAS_TABLE.get(key, key)
+
+
+def resolve_names(names):
+    """Versi kolom dari normalize_name: satu map atas nilai unik"""
+    names = pd.Series(names)
+    mapping = {n: normalize_name(n) for n in names.dropna().unique()}
+    return names.map(mapping).fillna(names.astype(str))
+
+
+@functools.lru_cache(maxsize=4096)
+def fuzzy_match(key, vocabulary, cutoff=FUZZY_CUTOFF):
+    """Kunci terdekat di vocabulary (tuple) atau None; hasil di-cache"""
+    found = difflib.get_close_matches(key, vocabulary, n=1, cutoff=cutoff)
+    return found[0] if found else None
+
+
+def match_report(data_keys, geo_keys):
+    """Ringkasan merge: jumlah cocok & kunci yang tidak punya pasangan di tiap sisi"""
+    data_set, geo_set = set(pd.Series(data_keys).dropna()), set(pd.Series(geo_keys).dropna())
+    return {
+        "matched": len(data_set & geo_set),
+        "only_data": sorted(data_set - geo_set),
+        "only_geometry": sorted(geo_set - data_set),
+        "fuzzy": {},
+    }
+
+
+def reconcile_keys(df, gdf, cutoff=FUZZY_CUTOFF):
+    """Cocokkan fuzzy Provinsi_Key data yang tak ada di geometri. Return (df, laporan)."""
+    report = match_report(df['Provinsi_Key'], gdf['Provinsi_Key'])
+    # Hanya kunci geometri yang belum berpasangan yang boleh jadi target (1-1)
+    free = tuple(report["only_geometry"])
+    fuzzy = {}
+    for key in report["only_data"]:
+        match = fuzzy_match(key, free, cutoff)
+        if match is not None and match not in fuzzy.values():
+            fuzzy[key] = match
+
+    if fuzzy:
+        df = df.assign(Provinsi_Key=df['Provinsi_Key'].replace(fuzzy))
+        report = match_report(df['Provinsi_Key'], gdf['Provinsi_Key'])
+    report["fuzzy"] = fuzzy
+    return df, report
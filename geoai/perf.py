@@ -0,0 +1,174 @@
+"""Instrumentasi jalur panas per rerun Streamlit.
+
+Setiap rerun (penuh atau fragment) adalah satu ``Run``: durasi tiap bagian
+bernama dicatat lewat ``section(nama)``, hit/miss fungsi ``st.cache_resource``
+lewat ``cached(nama)`` + ``note_miss(nama)`` di dalam body fungsi. Saat
+``run.finish()`` satu baris JSON ditulis ke log berotasi (default
+``logs/perf.jsonl``, ganti via env GEOAI_PERF_LOG) dan statistik bergulir
+(p50/p95 per bagian) diperbarui.
+"""
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_FILE = os.environ.get("GEOAI_PERF_LOG", os.path.join(ROOT_DIR, "logs", "perf.jsonl"))
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+WINDOW = 500  # jumlah sampel terakhir per bagian untuk p50/p95
+
+_local = threading.local()
+
+
+def debug_enabled(query_params=None):
+    """Panel performa aktif via env GEOAI_DEBUG=1 atau query ?debug=1"""
+    if os.environ.get("GEOAI_DEBUG") == "1":
+        return True
+    return query_params is not None and query_params.get("debug") == "1"
+
+
+def current_run():
+    return getattr(_local, "run", None)
+
+
+def note_miss(name):
+    """Dipanggil di dalam body fungsi ter-cache: body jalan berarti cache miss"""
+    run = current_run()
+    if run is not None:
+        run.misses.add(name)
+
+
+@contextmanager
+def section(name):
+    """Ukur satu bagian bernama pada run aktif (tanpa run: tidak mencatat apa pun)"""
+    run = current_run()
+    if run is None:
+        yield
+        return
+    with run.section(name):
+        yield
+
+
+@contextmanager
+def cached(name):
+    run = current_run()
+    if run is None:
+        yield
+        return
+    with run.cached(name):
+        yield
+
+
+class Run:
+    """Catatan satu rerun"""
+
+    def __init__(self, recorder, kind, session):
+        self.recorder = recorder
+        self.kind = kind
+        self.session = session
+        self.started = time.perf_counter()
+        self.sections = {}
+        self.cache = {}
+        self.misses = set()
+        self.finished = False
+        self.total_ms = None
+
+    @contextmanager
+    def section(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections[name] = self.sections.get(name, 0.0) + (time.perf_counter() - t0) * 1000
+
+    @contextmanager
+    def cached(self, name):
+        """Ukur pemanggilan fungsi ter-cache sekaligus catat hit/miss"""
+        with self.section(name):
+            yield
+        self.cache[name] = "miss" if name in self.misses else "hit"
+
+    def finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        if getattr(_local, "run", None) is self:
+            _local.run = None
+        self.recorder.record(self)
+
+
+class PerfRecorder:
+    """Log JSONL berotasi + statistik bergulir, dibagi semua sesi dalam satu proses"""
+
+    def __init__(self, log_file=LOG_FILE, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS, window=WINDOW):
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(f"geoai.perf.{uuid.uuid4().hex[:8]}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        if log_file:
+            os.makedirs(os.path.dirname(log_file), exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.logger.addHandler(handler)
+
+    def begin(self, kind="full", session=None):
+        """Mulai run baru di thread ini (satu thread skrip per rerun)"""
+        run = Run(self, kind, session)
+        _local.run = run
+        return run
+
+    @contextmanager
+    def fragment(self, name, session=None):
+        """Di dalam rerun penuh pakai run yang aktif; saat rerun fragment buat run sendiri"""
+        run = current_run()
+        if run is not None and not run.finished:
+            yield run
+            return
+        run = self.begin(f"fragment:{name}", session)
+        try:
+            yield run
+        finally:
+            run.finish()
+
+    def track(self, name, session=None):
+        """Dekorator untuk fungsi fragment: rerun fragment dicatat sebagai run sendiri"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.fragment(name, session):
+                    with section(name):
+                        return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, run):
+        total = run.total_ms = (time.perf_counter() - run.started) * 1000
+        with self._lock:
+            for name, ms in run.sections.items():
+                self._samples[name].append(ms)
+            self._samples[f"[{run.kind}] total"].append(total)
+        self.logger.info(json.dumps({
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "session": run.session,
+            "kind": run.kind,
+            "total_ms": round(total, 2),
+            "sections_ms": {k: round(v, 2) for k, v in run.sections.items()},
+            "cache": run.cache,
+        }))
+
+    def summary(self):
+        """p50/p95 bergulir per bagian"""
+        with self._lock:
+            items = {k: np.array(v) for k, v in self._samples.items() if v}
+        return {k: {"n": len(v), "p50": float(np.percentile(v, 50)), "p95": float(np.percentile(v, 95))}
+                for k, v in sorted(items.items())}
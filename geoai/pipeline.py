@@ -0,0 +1,80 @@
+"""Langkah data bersama app, halaman peta & warm-up, semuanya lewat render cache.
+
+Key cache ditentukan sekali di sini, sehingga warm-up saat server start
+(geoai/warmup.py) mengisi persis entri yang nanti dibaca sesi pertama.
+geopandas & shapely tetap hanya dimuat oleh langkah geometri.
+"""
+from geoai import datastore
+from geoai.cache import frame_version, geometry_version
+from geoai.maps import MAP_ZOOM, build_detail_index, merge_geodata, prepare_layers
+from geoai.names import reconcile_keys
+from geoai.sensitivity import ThresholdSweep
+from geoai.similarity import SimilarityIndex
+from geoai.table import TableIndex
+
+
+def dataset(render_cache):
+    """(df_panel, pesan_error) via sidecar Feather (lihat geoai/datastore.py)"""
+    return render_cache.get_or_build(("dataset", datastore.dataset_fingerprint()), datastore.load_or_dummy)
+
+
+def geo_level():
+    from geoai.geostore import level_for_zoom
+    return level_for_zoom(MAP_ZOOM)
+
+
+def geometry(render_cache, level):
+    """(gdf, versi) dari store lokal; GeometryStoreMissing jika store belum dibangun"""
+    from geoai.geostore import geometry_fingerprint, require_geometry
+    gdf = render_cache.get_or_build(("geometry", level, geometry_fingerprint(level)), lambda: require_geometry(level))
+    return gdf, geometry_version(gdf)
+
+
+def merge(render_cache, df, df_panel, panel_years, gdf, geo_version):
+    """Rekonsiliasi nama + merge geometri. Return (df, df_panel, gdf_final, name_report, data_version)"""
+    # Key cache berbasis isi data + geometri (aman dibagi antar proses lewat cache disk)
+    data_version = f"{frame_version(df)}:{geo_version}"
+    if panel_years:
+        data_version += f":{frame_version(df_panel)}"
+
+    name_report, gdf_final = None, None
+    if gdf is not None and df is not None:
+        # Nama data yang tidak ada di geometri dicocokkan fuzzy, sisanya dilaporkan
+        df, name_report = render_cache.get_or_build(("names", data_version), lambda: reconcile_keys(df, gdf))
+        if panel_years and name_report["fuzzy"]:
+            df_panel = df_panel.assign(Provinsi_Key=df_panel['Provinsi_Key'].replace(name_report["fuzzy"]))
+        gdf_final = render_cache.get_or_build(("merge", data_version), lambda: merge_geodata(gdf, df))
+    return df, df_panel, gdf_final, name_report, data_version
+
+
+def map_layers(render_cache, merged, panel_years, map_mode, var_select=None):
+    """GeoJSON ringkas, warna & legenda per (mode, indikator, versi data)"""
+    df, df_panel, gdf_final, _, data_version = merged
+    return render_cache.get_or_build(
+        ("layers", map_mode, var_select, data_version),
+        lambda: prepare_layers(gdf_final, df, map_mode, var_select, panel=df_panel if panel_years else None),
+    )
+
+
+def detail_index(render_cache, merged, panel_years):
+    df, df_panel, _, _, data_version = merged
+    return render_cache.get_or_build(("detail", data_version), lambda: build_detail_index(df_panel if panel_years else df))
+
+
+def similarity_index(render_cache, df):
+    """Indeks wilayah mirip atas Z-score indikator (per versi data, termasuk label re-klaster)"""
+    return render_cache.get_or_build(("similarity", frame_version(df)), lambda: SimilarityIndex(df))
+
+
+def threshold_sweep(render_cache, df, thresholds):
+    """Verdict simbolik untuk satu grid ambang (per versi data & grid)"""
+    key = ("sweep", frame_version(df), tuple(float(t) for t in thresholds))
+    return render_cache.get_or_build(key, lambda: ThresholdSweep(df, thresholds))
+
+
+def table_index(render_cache, merged, panel_years):
+    """Indeks tabel "Data Lengkap" (data panel: filter klaster & tahun)"""
+    df, df_panel, _, _, data_version = merged
+    if panel_years:
+        return render_cache.get_or_build(("table", data_version), lambda: TableIndex(df_panel, ('Cluster_Label', 'Tahun')))
+    return render_cache.get_or_build(("table", data_version), lambda: TableIndex(df))
@@ -0,0 +1,112 @@
+"""Simulasi what-if: ubah indikator beberapa wilayah, tetapkan klaster baru secara inkremental.
+
+t-SNE tidak punya transform untuk titik baru, jadi penetapan dilakukan di
+ruang Z-score indikator (mean & std data asli dibekukan) dengan aturan gaya
+DBSCAN: anggota klaster yang ada dipakai sebagai core sample; wilayah yang
+diubah masuk klaster core terdekat jika jaraknya tidak melebihi radius
+klaster itu (jarak tetangga terdekat terjauh antar anggota, yaitu jarak
+"rantai" DBSCAN-nya), selain itu menjadi noise. Wilayah yang diubah tetap di
+klasternya selama masih dalam radius klaster itu. Wilayah yang tidak diubah
+tetap memakai labelnya, jadi label wilayah lain tidak teracak.
+"""
+import numpy as np
+
+from geoai.clustering import feature_matrix
+from geoai.datastore import cluster_labels
+
+# Toleransi di atas jarak rantai terjauh: anggota terluar klaster berada tepat
+# di batas radius, tanpa toleransi perubahan sekecil apa pun menjadikannya noise.
+RADIUS_SCALE = 1.2
+
+
+def distances(a, b):
+    """Matriks jarak Euclid (len(a) x len(b)) lewat ||a||^2 + ||b||^2 - 2ab"""
+    sq = np.square(a).sum(axis=1)[:, None] + np.square(b).sum(axis=1)[None, :] - 2 * a @ b.T
+    return np.sqrt(np.maximum(sq, 0))
+
+
+class ScenarioModel:
+    """Core sample + radius per klaster dari satu frame berlabel"""
+
+    def __init__(self, df):
+        X = feature_matrix(df)
+        self.positions = {name: i for i, name in enumerate(df['Provinsi'])}
+        self.mean = np.nanmean(X, axis=0)
+        std = np.sqrt(np.nanvar(X, axis=0))
+        std[std < 10 * np.finfo(np.float64).eps] = 1.0
+        self.std = std
+
+        labels = df['Cluster'].to_numpy()
+        core = labels != -1
+        self.core_positions = np.flatnonzero(core)
+        self.core_labels = labels[core]
+        self.core_z = self.standardize(X[core])
+        self.radius = {}
+        for label in np.unique(self.core_labels):
+            members = self.core_z[self.core_labels == label]
+            if len(members) < 2:
+                self.radius[label] = 0.0
+                continue
+            d = distances(members, members)
+            np.fill_diagonal(d, np.inf)
+            self.radius[label] = RADIUS_SCALE * float(d.min(axis=1).max())
+
+    def standardize(self, X):
+        return np.nan_to_num((np.asarray(X, dtype=np.float64) - self.mean) / self.std)
+
+    def assign(self, X, positions, current):
+        """Label klaster (-1 = noise) untuk baris X yang berasal dari baris ``positions``.
+
+        Baris asal tidak dipakai sebagai core. Wilayah tetap di klaster ``current``
+        selama masih dalam radius klaster itu; selain itu ikut core terdekat.
+        """
+        z = self.standardize(X)
+        current = np.asarray(current)
+        if not len(self.core_z):
+            # Labelling tanpa klaster (semua noise): tidak ada core untuk diikuti
+            return np.full(len(z), -1, dtype=np.int64)
+        d = distances(z, self.core_z)
+        d[self.core_positions[None, :] == np.asarray(positions)[:, None]] = np.inf
+        nearest = d.argmin(axis=1)
+        labels = self.core_labels[nearest]
+        radius = np.array([self.radius.get(label, -1.0) for label in labels])
+        labels = np.where(d[np.arange(len(z)), nearest] <= radius, labels, -1)
+
+        d_own = np.where(self.core_labels[None, :] == current[:, None], d, np.inf).min(axis=1)
+        own_radius = np.array([self.radius.get(label, -1.0) for label in current])
+        return np.where(d_own <= own_radius, current, labels)
+
+def apply_scenario(df, model, edits):
+    """Terapkan edits [{"provinsi": [...], "indikator": nama, "persen": x}] -> (df baru, perubahan klaster).
+
+    Nilai dikalikan (1 + persen/100); hanya wilayah yang diubah ditetapkan ulang.
+    Perubahan: list {"Provinsi", "Sebelum", "Sesudah"} (id klaster, -1 = noise).
+    """
+    changed = {}
+    out = df.copy()
+    for edit in edits:
+        var = edit["indikator"]
+        if var not in out.columns or not edit["persen"]:
+            continue
+        rows = [model.positions[p] for p in edit["provinsi"] if p in model.positions]
+        # Indikator integer (harga, kepadatan, penerima bansos) tidak bisa menampung hasil persen
+        if out[var].dtype != np.float64:
+            out[var] = out[var].astype("float64")
+        col = out.columns.get_loc(var)
+        out.iloc[rows, col] = out.iloc[rows, col].to_numpy() * (1 + edit["persen"] / 100)
+        changed.update(dict.fromkeys(rows))
+    if not changed:
+        return df, []
+
+    rows = np.fromiter(changed, dtype=np.int64)
+    labels = out['Cluster'].to_numpy().copy()
+    old = labels[rows].copy()
+    # Label hanya berubah jika putusan model untuk baris itu berubah oleh edit;
+    # perbedaan ruang t-SNE vs Z-score tidak ikut mengubah wilayah yang diedit sedikit.
+    before = model.assign(feature_matrix(df.iloc[rows]), rows, old)
+    after = model.assign(feature_matrix(out.iloc[rows]), rows, old)
+    new = np.where(after == before, old, after)
+    labels[rows] = new
+    out = out.assign(Cluster=labels, Cluster_Label=cluster_labels(labels).to_numpy())
+    report = [{"Provinsi": out['Provinsi'].iat[r], "Sebelum": int(o), "Sesudah": int(n)} for r, o, n in zip(rows, old, new)]
+    return out, report
@@ -0,0 +1,75 @@
+"""Sensitivitas verdict ✅/⚠️/❌ terhadap ambang Z, untuk satu grid ambang sekaligus.
+
+Sinyal semua ambang dihitung dalam satu broadcast (t ambang x n profil x
+k indikator) lalu voting per dimensi lewat satu perkalian matriks batch,
+dengan fungsi yang sama seperti generate_emoji_analysis. Profil = rata-rata
+Z tiap klaster + Z tiap provinsi noise, jadi hasil pada ambang THRESHOLD
+identik dengan tabel interpretasi simbolik.
+"""
+import numpy as np
+import pandas as pd
+
+from geoai.analysis import SYMBOLS, THRESHOLD, dimension_matrix, dimension_votes, indicator_signals, profile_matrix
+from geoai.metadata import DIMENSI_DICT, INDIKATOR_NEGATIF
+
+THRESHOLDS = np.round(np.arange(0.1, 0.65, 0.05), 2)
+GRID_STEPS = [0.01, 0.05, 0.1]
+
+
+def threshold_grid(low, high, step):
+    """Grid ambang [low, high] dengan langkah ``step`` (dibulatkan agar 0.3 tetap 0.3)"""
+    return np.round(np.arange(low, high + step / 2, step), 4)
+
+
+class ThresholdSweep:
+    """Verdict per (ambang, profil, dimensi) + stabilitas terhadap verdict pada ``threshold``"""
+
+    def __init__(self, df, thresholds=THRESHOLDS, threshold=THRESHOLD, dimensions=DIMENSI_DICT):
+        profiles, var_cols, self.labels = profile_matrix(df)
+        negative = np.isin(var_cols, INDIKATOR_NEGATIF)
+        membership = dimension_matrix(var_cols, dimensions)
+        has_vars = membership.any(axis=0)
+        self.dimensions = [dim for dim, has in zip(dimensions, has_vars) if has]
+
+        # Ambang acuan selalu ikut di grid agar stabilitas terukur terhadapnya
+        self.thresholds = np.unique(np.append(np.asarray(thresholds, dtype=np.float64), threshold))
+        self.threshold = threshold
+        signals = indicator_signals(profiles[None], negative, self.thresholds[:, None, None])
+        self.codes = dimension_votes(signals, membership[:, has_vars]).astype(np.int8)  # (t, n, d)
+
+        self.baseline = self.codes[np.searchsorted(self.thresholds, threshold)]
+        self.stability = (self.codes == self.baseline).mean(axis=0)
+        self.flips = np.count_nonzero(np.diff(self.codes, axis=0), axis=0)
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def verdict_column(self):
+        return f"Verdict ({self.threshold:g})"
+
+    def unstable_rows(self):
+        """Posisi profil yang verdict-nya berubah di dalam grid (dimensi mana pun)"""
+        return np.flatnonzero(self.flips.any(axis=1))
+
+    def stability_frame(self, rows=None):
+        rows = np.arange(len(self)) if rows is None else rows
+        return pd.DataFrame(self.stability[rows], index=np.asarray(self.labels, dtype=object)[rows], columns=self.dimensions)
+
+    def flipped(self):
+        """Satu baris per (profil, dimensi) yang verdict-nya berubah di dalam grid"""
+        t, n, d = np.nonzero(np.diff(self.codes, axis=0))
+        if not len(t):
+            return pd.DataFrame(columns=["Profil", "Dimensi", self.verdict_column, "Rentang", "Berubah di ambang", "Stabilitas"])
+        changes = pd.DataFrame({"n": n, "d": d, "ambang": self.thresholds[t + 1]})
+        at = changes.groupby(["n", "d"], sort=True)["ambang"].agg(lambda s: ", ".join(f"{v:g}" for v in s))
+        n, d = (np.array(level) for level in zip(*at.index))
+        lo, hi = self.codes[:, n, d].min(axis=0), self.codes[:, n, d].max(axis=0)
+        return pd.DataFrame({
+            "Profil": np.asarray(self.labels, dtype=object)[n],
+            "Dimensi": np.asarray(self.dimensions, dtype=object)[d],
+            self.verdict_column: SYMBOLS[self.baseline[n, d] + 1],
+            "Rentang": [f"{a} … {b}" for a, b in zip(SYMBOLS[lo + 1], SYMBOLS[hi + 1])],
+            "Berubah di ambang": at.to_numpy(),
+            "Stabilitas": self.stability[n, d],
+        })
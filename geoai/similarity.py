@@ -0,0 +1,84 @@
+"""Pencarian wilayah paling mirip (tetangga terdekat) di ruang indikator Z-score.
+
+Matriks Z-score (NaN diisi 0 = rata-rata) dibangun sekali per versi data,
+plus salinan kontigu per dimensi DIMENSI_DICT. Query top-k cukup satu
+operasi array (n x k indikator) + argpartition, tanpa loop Python.
+
+Jarak = akar rata-rata berbobot selisih kuadrat Z (satuan simpangan baku),
+sehingga bisa dibandingkan antar dimensi dengan jumlah indikator berbeda.
+Indikator INDIKATOR_NEGATIF dibalik tandanya agar profil terbaca "tinggi =
+lebih baik"; jarak Euclid sendiri tidak berubah oleh pembalikan ini.
+"""
+import numpy as np
+import pandas as pd
+
+from geoai.analysis import standardize
+from geoai.metadata import CLEAN_VARS_LIST, DIMENSI_DICT, INDIKATOR_NEGATIF
+
+ALL_INDICATORS = "Semua indikator"
+
+
+class SimilarityIndex:
+    """Indeks tetangga terdekat atas Z-score indikator satu frame (satu baris = satu wilayah)"""
+
+    def __init__(self, df, dimensions=DIMENSI_DICT):
+        self.var_cols = [c for c in CLEAN_VARS_LIST if c in df.columns]
+        self.names = df['Provinsi'].to_numpy()
+        self.labels = df['Cluster_Label'].to_numpy()
+        self.positions = {name: i for i, name in enumerate(self.names)}
+        self.sign = np.where(np.isin(self.var_cols, INDIKATOR_NEGATIF), -1.0, 1.0)
+
+        z = np.nan_to_num(standardize(df[self.var_cols].to_numpy()))
+        self.z = np.ascontiguousarray(z * self.sign)
+        self.spaces = {ALL_INDICATORS: np.arange(len(self.var_cols))}
+        for dim, vars_ in dimensions.items():
+            cols = [i for i, v in enumerate(self.var_cols) if v in vars_]
+            if cols:
+                self.spaces[dim] = np.array(cols)
+        self._matrices = {space: np.ascontiguousarray(self.z[:, cols]) for space, cols in self.spaces.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+    def columns(self, space=ALL_INDICATORS):
+        return [self.var_cols[i] for i in self.spaces[space]]
+
+    def query(self, name, k=5, space=ALL_INDICATORS, weights=None):
+        """(posisi, jarak) k wilayah terdekat ke ``name``, urut dari yang paling mirip.
+
+        ``weights``: {indikator: bobot >= 0}; indikator yang tidak disebut berbobot 1.
+        """
+        matrix = self._matrices[space]
+        w = np.ones(matrix.shape[1])
+        if weights:
+            w = np.array([weights.get(c, 1.0) for c in self.columns(space)], dtype=np.float64)
+        if w.sum() <= 0:
+            raise ValueError("jumlah bobot indikator harus > 0")
+
+        i = self.positions[name]
+        dist = np.sqrt(np.square(matrix - matrix[i]) @ (w / w.sum()))
+        dist[i] = np.inf
+        k = min(k, len(dist) - 1)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        top = np.argpartition(dist, k - 1)[:k]
+        top = top[np.argsort(dist[top], kind='stable')]
+        return top, dist[top]
+
+    def neighbors(self, name, k=5, space=ALL_INDICATORS, weights=None, oriented=True):
+        """Tabel wilayah acuan + k tetangga: Provinsi, Klaster, Jarak & Z-score tiap indikator ruang itu.
+
+        ``oriented``: Z-score indikator negatif ditampilkan terbalik (tinggi = lebih baik).
+        """
+        top, dist = self.query(name, k, space, weights)
+        rows = np.concatenate([[self.positions[name]], top])
+        cols = self.spaces[space]
+        z = self.z[np.ix_(rows, cols)]
+        if not oriented:
+            z = z * self.sign[cols]
+        table = pd.DataFrame({
+            "Provinsi": self.names[rows],
+            "Klaster": self.labels[rows],
+            "Jarak": np.concatenate([[0.0], dist]),
+        })
+        return pd.concat([table, pd.DataFrame(z, columns=self.columns(space))], axis=1)
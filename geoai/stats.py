@@ -0,0 +1,46 @@
+"""Kubus statistik klaster x indikator untuk halaman Analisis Karakteristik.
+
+Dihitung sekali per versi data: jumlah, rata-rata, median, kuartil (metode
+linear, sama dengan Plotly), whisker Tukey 1,5 x IQR dan daftar outlier.
+Box plot dan profil rata-rata cukup membaca kubus ini, sehingga ukuran grafik
+tidak tumbuh dengan jumlah wilayah.
+"""
+import pandas as pd
+
+from geoai.metadata import CLEAN_VARS_LIST
+
+KEYS = ['Cluster_Label', 'Indikator']
+WHISKER_IQR = 1.5
+
+
+def cluster_cube(df):
+    """DataFrame berindeks (Cluster_Label, Indikator): count, mean, median, min, max,
+    q1, q3, lowerfence, upperfence, outliers (list (Provinsi, nilai))"""
+    var_cols = [c for c in CLEAN_VARS_LIST if c in df.columns]
+    long = df[['Provinsi', 'Cluster_Label'] + var_cols].melt(
+        id_vars=['Provinsi', 'Cluster_Label'], var_name='Indikator', value_name='Nilai'
+    ).dropna(subset=['Nilai'])
+    grouped = long.groupby(KEYS, sort=False)['Nilai']
+
+    cube = grouped.agg(['count', 'mean', 'median', 'min', 'max'])
+    quartiles = grouped.quantile([0.25, 0.75]).unstack()
+    cube['q1'], cube['q3'] = quartiles[0.25], quartiles[0.75]
+
+    # Whisker = nilai terjauh yang masih di dalam q1 - 1,5 IQR .. q3 + 1,5 IQR
+    iqr = cube['q3'] - cube['q1']
+    limits = pd.DataFrame({"lo": cube['q1'] - WHISKER_IQR * iqr, "hi": cube['q3'] + WHISKER_IQR * iqr})
+    long = long.join(limits, on=KEYS)
+    inside = (long['Nilai'] >= long['lo']) & (long['Nilai'] <= long['hi'])
+    fences = long[inside].groupby(KEYS, sort=False)['Nilai'].agg(['min', 'max'])
+    cube['lowerfence'], cube['upperfence'] = fences['min'], fences['max']
+
+    outside = long[~inside]
+    outliers = {key: list(zip(part['Provinsi'], part['Nilai'])) for key, part in outside.groupby(KEYS, sort=False)}
+    cube['outliers'] = [outliers.get(key, []) for key in cube.index]
+    return cube
+
+
+def cluster_means(cube, labels, var_cols):
+    """Rata-rata per klaster (baris urut label) untuk indikator terpilih"""
+    means = cube['mean'].unstack('Indikator')
+    return means.reindex(index=sorted(labels), columns=var_cols)
@@ -0,0 +1,74 @@
+"""Tabel "Data Lengkap" sisi server: indeks baris, filter, cari, urut & halaman.
+
+Indeks dibangun sekali per versi data (posisi baris per nilai kolom filter,
+teks pencarian yang sudah di-casefold, peringkat urut per kolom dibuat saat
+pertama dipakai). Setiap rerun hanya mengiris array posisi; yang dikirim ke
+browser cukup satu halaman berisi kolom yang ditampilkan.
+"""
+import numpy as np
+
+PAGE_SIZES = [25, 50, 100, 250]
+SEARCH_COLUMN = 'Provinsi'
+# Kolom internal yang tidak pernah ditampilkan
+HIDDEN_COLUMNS = ['Provinsi_Key', 'id']
+
+
+class TableIndex:
+    """Indeks baris satu frame untuk query tabel berhalaman"""
+
+    def __init__(self, df, filter_columns=('Cluster_Label',), search_column=SEARCH_COLUMN):
+        self.frame = df.reset_index(drop=True)
+        self.columns = [c for c in self.frame.columns if c not in HIDDEN_COLUMNS]
+        self.groups = {
+            col: {key: np.asarray(pos) for key, pos in self.frame.groupby(col, sort=True).indices.items()}
+            for col in filter_columns if col in self.frame.columns
+        }
+        self._search = self.frame[search_column].astype(str).str.casefold() if search_column in self.frame.columns else None
+        self._ranks = {}
+
+    def __len__(self):
+        return len(self.frame)
+
+    def options(self, col):
+        """Nilai unik (urut) kolom filter"""
+        return list(self.groups.get(col, {}))
+
+    def _rank(self, col, ascending):
+        """Peringkat tiap baris menurut kolom (NaN selalu di akhir), di-memo"""
+        key = (col, ascending)
+        if key not in self._ranks:
+            order = self.frame[col].sort_values(
+                ascending=ascending, na_position='last', kind='stable'
+            ).index.to_numpy()
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            self._ranks[key] = rank
+        return self._ranks[key]
+
+    def query(self, filters=None, search="", sort=None, ascending=True):
+        """Array posisi baris yang lolos filter {kolom: nilai} & pencarian, urut sesuai ``sort``"""
+        rows = None
+        for col, value in (filters or {}).items():
+            pos = self.groups[col].get(value, np.empty(0, dtype=np.int64))
+            rows = pos if rows is None else np.intersect1d(rows, pos, assume_unique=True)
+        if rows is None:
+            rows = np.arange(len(self.frame))
+
+        term = search.strip().casefold()
+        if term and self._search is not None:
+            hits = self._search.iloc[rows].str.contains(term, regex=False).to_numpy()
+            rows = rows[hits]
+
+        if sort:
+            rows = rows[np.argsort(self._rank(sort, ascending)[rows])]
+        return rows
+
+    def page(self, rows, page, page_size, columns=None):
+        """Irisan satu halaman (mulai 1) dengan kolom terpilih saja"""
+        start = (page - 1) * page_size
+        cols = [c for c in (columns or self.columns) if c in self.frame.columns]
+        return self.frame.iloc[rows[start:start + page_size], self.frame.columns.get_indexer(cols)]
+
+
+def page_count(total, page_size):
+    return max(1, -(-total // page_size))
@@ -0,0 +1,110 @@
+"""Warm-up data saat server start, bukan saat pengunjung pertama datang.
+
+Dataset & geometri dimuat paralel di thread pool, lalu merge, layer peta
+default (mode klaster), indeks detail & indeks tabel dibangun ke render cache
+dengan key yang sama seperti halaman peta (geoai/pipeline.py). Status per
+tahap bisa dibaca kapan saja untuk ditampilkan di sidebar.
+
+Dimulai oleh lifespan di serve.py (``streamlit run serve.py``); jika app
+dijalankan langsung (``streamlit run app.py``), sesi pertama yang memulainya.
+Satu warm-up per proses: ``start`` berikutnya mengembalikan objek yang sama.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from geoai import datastore, pipeline
+from geoai.cache import make_cache
+from geoai.maps import MODE_KLASTER
+
+RENDER_CACHE_SIZE = 32
+WAITING, RUNNING, DONE, FAILED, SKIPPED = "menunggu", "berjalan", "siap", "gagal", "dilewati"
+STEPS = ["dataset", "geometri", "merge", "peta", "tabel"]
+
+_lock = threading.Lock()
+_warmup = None
+
+
+class Warmup:
+    """Status warm-up satu proses: tahap -> menunggu/berjalan/siap/gagal/dilewati + durasi"""
+
+    def __init__(self, render_cache):
+        self.render_cache = render_cache
+        self.status = {step: WAITING for step in STEPS}
+        self.seconds = {}
+        self.errors = {}
+        self._dataset_ready = threading.Event()
+        self._done = threading.Event()
+
+    @property
+    def ready(self):
+        """Semua tahap selesai (berhasil atau gagal)"""
+        return self._done.is_set()
+
+    @property
+    def dataset_ready(self):
+        return self._dataset_ready.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def _step(self, name, fn, *args):
+        self.status[name] = RUNNING
+        t0 = time.perf_counter()
+        try:
+            result = fn(*args)
+            self.status[name] = DONE
+            return result
+        except Exception as e:
+            self.status[name] = FAILED
+            self.errors[name] = str(e)
+            return None
+        finally:
+            self.seconds[name] = time.perf_counter() - t0
+            if name == "dataset":
+                self._dataset_ready.set()
+
+    def run(self):
+        cache = self.render_cache
+        try:
+            # Parse dataset & baca geometri tidak saling bergantung
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="geoai-warmup") as pool:
+                f_data = pool.submit(self._step, "dataset", pipeline.dataset, cache)
+                f_geo = pool.submit(self._step, "geometri", lambda: pipeline.geometry(cache, pipeline.geo_level()))
+                loaded, geo = f_data.result(), f_geo.result()
+            if loaded is None or geo is None:
+                return
+
+            df_panel = loaded[0]
+            panel_years = datastore.panel_years(df_panel)
+            df = datastore.year_snapshot(df_panel)
+            merged = self._step("merge", pipeline.merge, cache, df, df_panel, panel_years, *geo)
+            if merged is None or merged[2] is None:
+                return
+            self._step("peta", lambda: (pipeline.map_layers(cache, merged, panel_years, MODE_KLASTER),
+                                        pipeline.detail_index(cache, merged, panel_years)))
+            self._step("tabel", pipeline.table_index, cache, merged, panel_years)
+        finally:
+            # Tahap yang tidak sempat jalan (dataset/geometri gagal) ditandai dilewati
+            for step, status in self.status.items():
+                if status == WAITING:
+                    self.status[step] = SKIPPED
+            self._dataset_ready.set()
+            self._done.set()
+            print("Warm-up: " + ", ".join(f"{step} {status} ({self.seconds.get(step, 0):.2f} s)"
+                                          for step, status in self.status.items()))
+
+
+def start(render_cache=None):
+    """Mulai warm-up di thread latar (sekali per proses) dan kembalikan status-nya"""
+    global _warmup
+    with _lock:
+        if _warmup is None:
+            _warmup = Warmup(render_cache or make_cache(maxsize=RENDER_CACHE_SIZE))
+            threading.Thread(target=_warmup.run, name="geoai-warmup", daemon=True).start()
+        return _warmup
+
+
+def render_cache():
+    """Render cache proses ini (yang sama dengan yang diisi warm-up)"""
+    return start().render_cache
@@ -0,0 +1,20 @@
+"""Entry point server dengan warm-up saat start: ``streamlit run serve.py``.
+
+Lifespan st.App memulai geoai/warmup.py sebelum sesi pertama masuk, sehingga
+pengunjung pertama mendapat cache yang sudah hangat. ``streamlit run app.py``
+tetap jalan, hanya warm-up-nya baru dimulai oleh sesi pertama.
+"""
+from contextlib import asynccontextmanager
+
+import streamlit as st
+
+from geoai import warmup
+
+
+@asynccontextmanager
+async def lifespan(app):
+    state = warmup.start()
+    yield {"warmup": state}
+
+
+app = st.App("app.py", lifespan=lifespan)
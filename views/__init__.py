@@ -0,0 +1 @@
+"""Halaman dashboard; tiap modul diimpor app.py saat halamannya dibuka."""
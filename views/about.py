@@ -0,0 +1,36 @@
+"""HALAMAN 4: TENTANG METODE (teks statis)."""
+import streamlit as st
+
+
+def render(ctx):
+    st.title("Tentang Metode GeoAI")
+        
+    st.markdown("""
+    ### 1. Geospatial Artificial Intelligence (GeoAI)
+    GeoAI adalah pendekatan multidisiplin yang menggabungkan metode dari geografi (khususnya Sistem Informasi Geografis/SIG) dengan Kecerdasan Buatan (AI), terutama *Machine Learning*. 
+    
+    Dalam penelitian ini, GeoAI digunakan untuk memetakan wilayah ketahanan pangan di Indonesia dengan cara yang lebih adaptif terhadap pola data yang kompleks, melampaui metode klasifikasi statistik konvensional.
+    
+    ### 2. Tahapan Analisis (Metode Hybrid)
+    Penelitian ini menggunakan kombinasi dua algoritma *Unsupervised Learning*:
+    
+    #### **A. t-SNE (t-Distributed Stochastic Neighbor Embedding)**
+    t-SNE digunakan sebagai langkah awal untuk **Reduksi Dimensi**.
+    * **Masalah:** Data ketahanan pangan memiliki 14 dimensi (variabel) yang sulit dikelompokkan secara langsung karena fenomena *curse of dimensionality*.
+    * **Solusi:** t-SNE memproyeksikan data 14 dimensi tersebut ke dalam ruang 2 dimensi (sumbu X dan Y baru).
+    * **Kelebihan:** Sangat unggul dalam mempertahankan struktur lokal, artinya provinsi yang memiliki kemiripan karakteristik akan diletakkan sangat berdekatan dalam peta visualisasi.
+    
+    #### **B. DBSCAN (Density-Based Spatial Clustering)**
+    DBSCAN digunakan untuk melakukan **Clustering** pada hasil reduksi t-SNE.
+    * **Konsep:** Mengelompokkan data berdasarkan kepadatan titik. Titik-titik yang berkumpul padat dianggap satu klaster.
+    * **Keunggulan vs K-Means:** 1. Tidak perlu menentukan jumlah klaster (K) secara manual.
+        2. Bentuk klaster fleksibel (tidak harus bulat).
+        3. **Deteksi Noise:** Provinsi yang karakteristiknya sangat unik (berbeda jauh dari provinsi lain) tidak akan dipaksa masuk klaster, melainkan dilabeli sebagai **Noise/Outlier (-1)**. Ini sangat penting untuk mendeteksi wilayah ekstrem (sangat rawan atau sangat tahan).
+    
+    ### 3. Implementasi Sistem
+    Dashboard ini dibangun menggunakan **Python** dengan library:
+    * **Streamlit:** Framework antarmuka web interaktif.
+    * **Folium:** Visualisasi peta geospasial interaktif.
+    * **Scikit-Learn:** Implementasi algoritma Machine Learning (StandardScaler, t-SNE, DBSCAN).
+    """)
+    st.success("© 2025 Amelia Kurnia Fitri - Proyek Akhir Statistika Bisnis ITS")
@@ -0,0 +1,99 @@
+"""HALAMAN 2: ANALISIS KARAKTERISTIK (Plotly diimpor hanya di halaman ini)."""
+import numpy as np
+import streamlit as st
+
+from geoai import perf, pipeline
+from geoai.analysis import generate_emoji_analysis
+from geoai.cache import frame_version
+from geoai.charts import distribution_figure, profile_figure, stability_figure, sweep_figure
+from geoai.metadata import DIMENSI_DICT
+from geoai.sensitivity import GRID_STEPS, threshold_grid
+from geoai.stats import cluster_cube
+
+# Heatmap sensitivitas: baris terbanyak (profil paling tidak stabil dulu)
+MAX_HEATMAP_ROWS = 60
+
+
+def render(ctx):
+    df, render_cache = ctx["df"], ctx["render_cache"]
+    st.title("Analisis Karakteristik Klaster")
+    # Statistik klaster x indikator sekali per versi data; kedua tab membaca dari sini
+    cube = render_cache.get_or_build(("cube", frame_version(df)), lambda: cluster_cube(df))
+
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📈 Distribusi", "📊 Profil Rata-rata", "📝 Interpretasi Simbolik",
+                                            "🔗 Wilayah Mirip", "🎚️ Sensitivitas Ambang"])
+
+    with tab1:
+        st.info("Visualisasi sebaran data.")
+        var_analisis = st.selectbox("Pilih Variabel:", ctx["available_features"])
+        show_points = st.checkbox("Tampilkan semua titik", value=False)
+        with perf.section("box_plot"):
+            st.plotly_chart(distribution_figure(df, var_analisis, cube, show_points), use_container_width=True)
+
+    with tab2:
+        st.info("Membandingkan rata-rata Klaster Utama vs Noise.")
+        dim_select = st.selectbox("Pilih Dimensi:", list(DIMENSI_DICT.keys()))
+
+        outlier_options = df[df['Cluster'] == -1]['Provinsi'].unique().tolist()
+        selected_outliers = st.multiselect("Pilih Outlier untuk dibandingkan:", outlier_options)
+
+        fig2 = profile_figure(df, dim_select, selected_outliers, cube)
+        if fig2 is not None:
+            st.plotly_chart(fig2, use_container_width=True)
+
+    with tab3:
+        st.subheader("Interpretasi Kualitatif (Z-Score)")
+        with perf.section("emoji_table"):
+            df_emoji = render_cache.get_or_build(("emoji", frame_version(df)), lambda: generate_emoji_analysis(df))
+            st.dataframe(df_emoji, use_container_width=True, hide_index=True)
+
+    with tab4:
+        st.info("Wilayah dengan profil indikator paling mirip (jarak Z-score, makin kecil makin mirip).")
+        similar_index = pipeline.similarity_index(render_cache, df)
+        c1, c2, c3 = st.columns([2, 2, 1])
+        reference = c1.selectbox("Wilayah acuan:", sorted(similar_index.positions))
+        space = c2.selectbox("Ruang indikator:", list(similar_index.spaces))
+        max_k = max(1, len(similar_index) - 1)
+        k = c3.number_input("Jumlah:", min_value=1, max_value=max_k, value=min(5, max_k))
+
+        with st.expander("⚖️ Bobot indikator"):
+            oriented = st.checkbox("Balik tanda indikator negatif (tinggi = lebih baik)", value=True)
+            weights = {c: st.slider(c, 0.0, 3.0, 1.0, 0.5, key=f"bobot_{c}") for c in similar_index.columns(space)}
+
+        if sum(weights.values()) <= 0:
+            st.warning("Minimal satu indikator harus berbobot > 0.")
+        else:
+            with perf.section("similar_query"):
+                table = similar_index.neighbors(reference, k, space, weights, oriented)
+            col_cfg = {c: st.column_config.NumberColumn(format="%.2f") for c in table.columns[2:]}
+            st.dataframe(table, column_config=col_cfg, use_container_width=True, hide_index=True)
+            st.caption("Baris pertama = wilayah acuan; kolom indikator berisi Z-score.")
+
+    with tab5:
+        st.info("Seberapa stabil verdict ✅/⚠️/❌ jika batas \"sekitar rata-rata\" (±0,3 Z) digeser.")
+        c1, c2, c3 = st.columns([2, 1, 1])
+        low, high = c1.slider("Rentang ambang Z:", 0.05, 1.5, (0.1, 0.6), 0.05)
+        step = c2.selectbox("Langkah:", GRID_STEPS, index=1)
+        only_unstable = c3.checkbox("Hanya profil yang berubah", value=True)
+
+        # Semua ambang x profil x dimensi dalam satu operasi array, di-cache per grid
+        with perf.section("threshold_sweep"):
+            sweep = pipeline.threshold_sweep(render_cache, df, threshold_grid(low, high, step))
+        unstable = sweep.unstable_rows()
+        m1, m2 = st.columns(2)
+        m1.metric("Verdict stabil di seluruh grid", f"{1 - np.count_nonzero(sweep.flips) / max(sweep.flips.size, 1):.0%}")
+        m2.metric("Profil dengan verdict berubah", f"{len(unstable)} / {len(sweep)}")
+
+        rows = unstable if only_unstable else np.arange(len(sweep))
+        if len(rows) > MAX_HEATMAP_ROWS:
+            least_stable = np.argsort(sweep.stability[rows].min(axis=1), kind='stable')[:MAX_HEATMAP_ROWS]
+            rows = np.sort(rows[least_stable])
+            st.caption(f"Heatmap menampilkan {MAX_HEATMAP_ROWS} profil paling tidak stabil; tabel di bawah memuat semuanya.")
+        if not len(rows):
+            st.success("Tidak ada verdict yang berubah di rentang ambang ini.")
+        else:
+            st.plotly_chart(stability_figure(sweep, rows), use_container_width=True)
+            dim_sweep = st.selectbox("Dimensi:", sweep.dimensions)
+            st.plotly_chart(sweep_figure(sweep, dim_sweep, rows), use_container_width=True)
+            st.dataframe(sweep.flipped(), column_config={"Stabilitas": st.column_config.ProgressColumn(min_value=0, max_value=1)},
+                         use_container_width=True, hide_index=True)
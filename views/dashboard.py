@@ -0,0 +1,159 @@
+"""HALAMAN 1: DASHBOARD (geometri, Folium & streamlit_folium hanya dimuat di sini)."""
+import streamlit as st
+from streamlit_folium import st_folium
+
+from geoai import perf, pipeline
+from geoai.geostore import GeometryStoreMissing
+from geoai.maps import MODE_KLASTER, MODE_VARIABEL, build_map, clicked_key
+from geoai.table import PAGE_SIZES, page_count
+
+GEO_LEVEL = pipeline.geo_level()
+SIMILAR_K = 5
+# Batas menunggu warm-up (detik); setelahnya geometri & merge dimuat langsung di sesi ini
+WARMUP_TIMEOUT = 30
+
+
+@st.cache_resource(max_entries=2)
+def load_geojson(level, _render_cache):
+    """Geometri provinsi dari store lokal (lihat geoai/geostore.py). Return (gdf, versi).
+
+    cache_resource: satu GeoDataFrame per proses untuk semua sesi, tanpa salinan per panggilan.
+    """
+    perf.note_miss("load_geojson")
+    return pipeline.geometry(_render_cache, level)
+
+
+def merge_data(ctx):
+    """Rekonsiliasi nama + merge geometri (dipakai ulang selama data & geometri tidak berubah)"""
+    render_cache = ctx["render_cache"]
+    try:
+        with perf.cached("load_geojson"):
+            gdf, geo_version = load_geojson(GEO_LEVEL, render_cache)
+    except GeometryStoreMissing as e:
+        # Tanpa store tidak ada fallback ke URL: peta kosong, tabel tetap tampil
+        st.error(f"🗺️ {e}")
+        gdf, geo_version = None, None
+    with perf.section("merge"):
+        return pipeline.merge(render_cache, ctx["df"], ctx["df_panel"], ctx["panel_years"], gdf, geo_version)
+
+
+def merge_notes(gdf_final, name_report):
+    """Peringatan match rendah & laporan pencocokan nama (di sidebar)"""
+    if gdf_final is not None:
+        match_c = gdf_final[gdf_final['Cluster_Label'] != "Tidak Ada Data"].shape[0]
+        if match_c < 10: st.warning(f"⚠️ Data Match Rendah: {match_c} Provinsi")
+    if name_report and (name_report["fuzzy"] or name_report["only_data"] or name_report["only_geometry"]):
+        with st.expander(f"🔎 Pencocokan Nama ({name_report['matched']} cocok)"):
+            if name_report["fuzzy"]:
+                st.caption("Dicocokkan otomatis (mirip):")
+                st.write(name_report["fuzzy"])
+            if name_report["only_data"]:
+                st.caption("Ada di data, tidak ada di peta:")
+                st.write(", ".join(name_report["only_data"]))
+            if name_report["only_geometry"]:
+                st.caption("Ada di peta, tidak ada di data:")
+                st.write(", ".join(name_report["only_geometry"]))
+
+
+def render(ctx):
+    panel_years, render_cache, available_features = ctx["panel_years"], ctx["render_cache"], ctx["available_features"]
+    perf_recorder, perf_session = ctx["perf_recorder"], ctx["perf_session"]
+    if not ctx["warmup"].ready:
+        # Geometri/merge sedang dibangun warm-up: tunggu hasilnya, jangan bangun ulang.
+        # Menunggu dibatasi agar warm-up yang macet tidak menahan halaman.
+        with st.spinner("Menyiapkan peta..."):
+            ctx["warmup"].wait(WARMUP_TIMEOUT)
+    merged = merge_data(ctx)
+    with ctx["sidebar_notes"]:
+        merge_notes(merged[2], merged[3])
+
+    st.title("Peta Klaster Ketahanan Pangan")
+
+    detail_index = pipeline.detail_index(render_cache, merged, panel_years)
+    similar_index = pipeline.similarity_index(render_cache, ctx["df"])
+    if panel_years:
+        st.caption(f"Data panel {panel_years[0]}–{panel_years[-1]}: geser slider / tekan ▶ di peta untuk berganti tahun. "
+                   f"Halaman lain memakai tahun {panel_years[-1]}.")
+
+    # Peta + panel detail dalam satu fragment: klik provinsi / ganti mode hanya
+    # menjalankan ulang bagian ini, bukan seluruh halaman.
+    @st.fragment
+    @perf_recorder.track("map_panel", perf_session)
+    def map_panel():
+        c1, c2 = st.columns([1, 2])
+        with c1: map_mode = st.radio("Mode Tampilan:", [MODE_KLASTER, MODE_VARIABEL], horizontal=True)
+        with c2: var_select = st.selectbox("Pilih Indikator:", available_features) if map_mode == MODE_VARIABEL else None
+
+        # GeoJSON ringkas, warna & legenda di-cache per (mode, indikator, versi data);
+        # background hanya dipakai saat merakit peta.
+        with perf.section("map_layers"):
+            layers = pipeline.map_layers(render_cache, merged, panel_years, map_mode, var_select)
+        with perf.section("map_build"):
+            m = build_map(layers, map_mode, var_select, ctx["tile_provider"])
+
+        with perf.section("st_folium"):
+            st_data = st_folium(m, width="100%", height=500, returned_objects=["last_active_drawing"])
+        caption = f"Payload geometri peta: {layers['payload_bytes'] / 1024:,.0f} KB"
+        if layers["years"]:
+            caption += f" · update {len(panel_years)} tahun: {layers['frames_bytes'] / 1024:,.0f} KB (dikirim sekali)"
+        st.caption(caption)
+
+        detail = detail_index.get(clicked_key(st_data))
+        if detail:
+            st.divider()
+            st.subheader(f"📍 Detail: {detail['Provinsi']}")
+            k1, *k_metrics = st.columns(1 + len(detail["metrics"]))
+            k1.metric("Status", detail["Status"])
+            for col, (label, value) in zip(k_metrics, detail["metrics"]):
+                col.metric(label, value)
+            if detail["Provinsi"] in similar_index.positions:
+                st.caption("🔗 Wilayah paling mirip (semua indikator, jarak Z-score):")
+                similar = similar_index.neighbors(detail["Provinsi"], SIMILAR_K).iloc[1:, :3]
+                st.dataframe(similar, column_config={"Jarak": st.column_config.NumberColumn(format="%.2f")},
+                             use_container_width=True, hide_index=True)
+
+    # Tabel di fragment sendiri: ganti "Filter Klaster" tidak menyentuh peta.
+    # Filter, cari & urut di server lewat indeks; browser hanya menerima satu halaman.
+    table_index = pipeline.table_index(render_cache, merged, panel_years)
+
+    @st.fragment
+    @perf_recorder.track("data_table", perf_session)
+    def data_table():
+        st.subheader("📋 Data Lengkap")
+        filters = {}
+        c_cols = st.columns([1, 1, 2] if panel_years else [1, 2])
+        c_filter = c_cols[0].selectbox("Filter Klaster:", ["Semua"] + table_index.options('Cluster_Label'))
+        if c_filter != "Semua": filters['Cluster_Label'] = c_filter
+        if panel_years:
+            years = table_index.options('Tahun')
+            filters['Tahun'] = c_cols[1].selectbox("Tahun:", years, index=len(years) - 1)
+        search = c_cols[-1].text_input("Cari wilayah:", placeholder="nama wilayah")
+
+        default_cols = ['Provinsi', 'Cluster_Label'] + available_features
+        with st.expander("⚙️ Kolom & urutan"):
+            columns = st.multiselect("Kolom ditampilkan:", table_index.columns,
+                                     default=[c for c in default_cols if c in table_index.columns])
+            s1, s2, s3 = st.columns([2, 1, 1])
+            sort_col = s1.selectbox("Urutkan menurut:", ["(asli)"] + table_index.columns)
+            descending = s2.toggle("Menurun", value=False)
+            page_size = s3.selectbox("Baris per halaman:", PAGE_SIZES)
+
+        with perf.section("table_query"):
+            rows = table_index.query(filters, search, None if sort_col == "(asli)" else sort_col, not descending)
+        n_pages = page_count(len(rows), page_size)
+        # Filter baru bisa mengecilkan jumlah halaman
+        if st.session_state.get("table_page", 1) > n_pages:
+            st.session_state["table_page"] = n_pages
+        page = st.number_input(f"Halaman (dari {n_pages}):", min_value=1, max_value=n_pages, step=1, key="table_page")
+        df_show = table_index.page(rows, page, page_size, columns)
+
+        col_cfg = {"Provinsi": st.column_config.TextColumn("Provinsi", pinned=True)}
+        for col in available_features: col_cfg[col] = st.column_config.NumberColumn(format="%.2f")
+        st.dataframe(df_show, column_config=col_cfg, use_container_width=True, hide_index=True)
+        start = (page - 1) * page_size
+        st.caption(f"Baris {min(start + 1, len(rows))}–{start + len(df_show)} dari {len(rows):,} "
+                   f"(total {len(table_index):,})")
+
+    map_panel()
+    st.divider()
+    data_table()
@@ -0,0 +1,22 @@
+"""HALAMAN 3: METADATA & DEFINISI (tanpa library berat)."""
+import streamlit as st
+
+from geoai.metadata import DIMENSI_DICT, VAR_MAPPING, VAR_METADATA
+
+
+def render(ctx):
+    st.title("Kamus Data & Definisi Variabel")
+    st.markdown("Definisi operasional variabel merujuk pada **Bab 3 Metodologi Penelitian**.")
+    
+    for dim, vars_ in DIMENSI_DICT.items():
+        with st.expander(f"📂 {dim}", expanded=True):
+            for v in vars_:
+                code = [k for k, val in VAR_MAPPING.items() if val == v][0]
+                info = VAR_METADATA.get(code, {})
+                st.markdown(f"**{code} - {v}**")
+                c1, c2 = st.columns([1, 4])
+                with c1:
+                    st.info(f"**Satuan:**\n{info.get('Unit')}")
+                with c2:
+                    st.write(f"**Definisi:** {info.get('Def')}")
+                st.divider()